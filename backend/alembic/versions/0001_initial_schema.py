@@ -0,0 +1,133 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+Databases created by the old create_all() bootstrap already have these
+tables; init_db() stamps them at this revision instead of re-creating them.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.types import GUID, StringArray
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("full_name", sa.String(255), nullable=False),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("role", sa.String(50), nullable=False),
+        sa.Column("skillsets", StringArray()),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "projects",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("domain", sa.String(100)),
+        sa.Column("tech_stack", StringArray()),
+        sa.Column("difficulty_level", sa.String(50), nullable=False),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_projects_name", "projects", ["name"])
+
+    op.create_table(
+        "assignments",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("project_id", GUID(), sa.ForeignKey("projects.id"), nullable=False),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("skillsets", StringArray(), nullable=False),
+        sa.Column("difficulty_level", sa.String(50), nullable=False),
+        sa.Column("duration_days", sa.Integer(), nullable=False),
+        sa.Column("instructions", sa.Text()),
+        sa.Column("starter_code_url", sa.String(500)),
+        sa.Column("reference_materials", sa.JSON()),
+        sa.Column("submission_criteria", sa.JSON()),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("created_by", GUID(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_assignments_title", "assignments", ["title"])
+
+    op.create_table(
+        "candidate_assignments",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("candidate_id", GUID(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("assignment_id", GUID(), sa.ForeignKey("assignments.id"), nullable=False),
+        sa.Column("assigned_by", GUID(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("assigned_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("deadline", sa.DateTime(timezone=True)),
+        sa.Column("status", sa.String(50)),
+        sa.Column("progress_percentage", sa.Integer()),
+        sa.Column("notes", sa.String(1000)),
+    )
+
+    op.create_table(
+        "submissions",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column(
+            "candidate_assignment_id", GUID(),
+            sa.ForeignKey("candidate_assignments.id"), nullable=False
+        ),
+        sa.Column("submission_type", sa.String(50), nullable=False),
+        sa.Column("submission_url", sa.String(500)),
+        sa.Column("files", sa.JSON()),
+        sa.Column("submitted_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("status", sa.String(50)),
+        sa.Column("notes", sa.Text()),
+    )
+
+    op.create_table(
+        "reviews",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("submission_id", GUID(), sa.ForeignKey("submissions.id"), nullable=False),
+        sa.Column("reviewer_id", GUID(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("score", sa.Integer()),
+        sa.Column("feedback", sa.Text()),
+        sa.Column("criteria_scores", sa.JSON()),
+        sa.Column("reviewed_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("status", sa.String(50)),
+    )
+
+    op.create_table(
+        "certificates",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("candidate_id", GUID(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("assignment_id", GUID(), sa.ForeignKey("assignments.id"), nullable=False),
+        sa.Column("certificate_number", sa.String(50), nullable=False),
+        sa.Column("score", sa.Integer()),
+        sa.Column("skills_demonstrated", StringArray()),
+        sa.Column("issued_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("pdf_url", sa.String(500)),
+        sa.Column("is_active", sa.Boolean()),
+    )
+    op.create_index("ix_certificates_certificate_number", "certificates", ["certificate_number"], unique=True)
+
+
+def downgrade():
+    op.drop_table("certificates")
+    op.drop_table("reviews")
+    op.drop_table("submissions")
+    op.drop_table("candidate_assignments")
+    op.drop_table("assignments")
+    op.drop_table("projects")
+    op.drop_table("users")
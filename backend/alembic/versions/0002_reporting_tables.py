@@ -0,0 +1,84 @@
+"""Reporting tables and change-tracking columns
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:05:00
+
+Adds the rollup counters, activity buckets and job watermarks, the
+completed_at stamp on candidate assignments and updated_at on the tables
+exported incrementally.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.types import GUID
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+UPDATED_AT_TABLES = ["candidate_assignments", "submissions", "reviews", "certificates"]
+
+
+def upgrade():
+    # Databases bootstrapped with create_all() may already have some of these;
+    # offline (--sql) runs cannot inspect and emit everything
+    inspector = None if op.get_context().as_sql else sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names()) if inspector else set()
+
+    def add_missing_column(table, column):
+        if inspector is None or column.name not in {existing["name"] for existing in inspector.get_columns(table)}:
+            op.add_column(table, column)
+
+    add_missing_column("candidate_assignments", sa.Column("completed_at", sa.DateTime(timezone=True)))
+    for table in UPDATED_AT_TABLES:
+        add_missing_column(table, sa.Column("updated_at", sa.DateTime(timezone=True)))
+
+    if "rollup_counters" not in tables:
+        _create_rollup_counters()
+    if "activity_buckets" not in tables:
+        _create_activity_buckets()
+    if "job_watermarks" not in tables:
+        _create_job_watermarks()
+
+
+def _create_rollup_counters():
+    op.create_table(
+        "rollup_counters",
+        sa.Column("metric", sa.String(50), primary_key=True),
+        sa.Column("project_id", GUID(), primary_key=True),
+        sa.Column("assignment_id", GUID(), primary_key=True),
+        sa.Column("status", sa.String(50), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("value", sa.Integer(), nullable=False),
+    )
+
+
+def _create_activity_buckets():
+    op.create_table(
+        "activity_buckets",
+        sa.Column("metric", sa.String(50), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("project_id", GUID(), primary_key=True),
+        sa.Column("skillset", sa.String(100), primary_key=True),
+        sa.Column("value", sa.Integer(), nullable=False),
+    )
+
+
+def _create_job_watermarks():
+    op.create_table(
+        "job_watermarks",
+        sa.Column("job_name", sa.String(100), primary_key=True),
+        sa.Column("last_run_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("job_watermarks")
+    op.drop_table("activity_buckets")
+    op.drop_table("rollup_counters")
+    for table in UPDATED_AT_TABLES:
+        op.drop_column(table, "updated_at")
+    op.drop_column("candidate_assignments", "completed_at")
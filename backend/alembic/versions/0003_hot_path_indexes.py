@@ -0,0 +1,53 @@
+"""Hot-path composite and foreign key indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:10:00
+
+Indexes are built with CREATE INDEX CONCURRENTLY so the tables stay writable
+while a large deployment migrates. Postgres refuses concurrent builds inside
+a transaction, hence the autocommit block. A build that was interrupted
+leaves an INVALID index behind; drop it and re-run the upgrade.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns); keep in sync with the models' index declarations
+INDEXES = [
+    # Candidate dashboards and "assignments of candidate X in status Y"
+    ("ix_candidate_assignments_candidate_id_status", "candidate_assignments", ["candidate_id", "status"]),
+    # Overdue counts: open statuses with a deadline in the past
+    ("ix_candidate_assignments_status_deadline", "candidate_assignments", ["status", "deadline"]),
+    ("ix_candidate_assignments_assignment_id", "candidate_assignments", ["assignment_id"]),
+    ("ix_candidate_assignments_assigned_by", "candidate_assignments", ["assigned_by"]),
+    # Pending review queue
+    ("ix_submissions_status", "submissions", ["status"]),
+    ("ix_submissions_candidate_assignment_id", "submissions", ["candidate_assignment_id"]),
+    # "Has this reviewer already reviewed this submission" and reviews per submission
+    ("ix_reviews_submission_id_reviewer_id", "reviews", ["submission_id", "reviewer_id"]),
+    ("ix_reviews_reviewer_id", "reviews", ["reviewer_id"]),
+    # Duplicate certificate check and certificates per candidate
+    ("ix_certificates_candidate_id_assignment_id", "certificates", ["candidate_id", "assignment_id"]),
+    ("ix_certificates_assignment_id", "certificates", ["assignment_id"]),
+    ("ix_assignments_project_id", "assignments", ["project_id"]),
+    ("ix_assignments_created_by", "assignments", ["created_by"]),
+    # Candidate listings filter on role
+    ("ix_users_role", "users", ["role"]),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
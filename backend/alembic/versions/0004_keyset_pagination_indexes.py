@@ -0,0 +1,38 @@
+"""Indexes for keyset pagination of list endpoints
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 10:30:00
+
+Each list endpoint pages by (creation timestamp, id); these indexes let a
+page start at the cursor position instead of scanning past the earlier rows.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns); keep in sync with the models' index declarations
+INDEXES = [
+    ("ix_users_role_created_at_id", "users", ["role", "created_at", "id"]),
+    ("ix_projects_created_at_id", "projects", ["created_at", "id"]),
+    ("ix_assignments_created_at_id", "assignments", ["created_at", "id"]),
+    ("ix_candidate_assignments_assigned_at_id", "candidate_assignments", ["assigned_at", "id"]),
+    ("ix_certificates_issued_at_id", "certificates", ["issued_at", "id"]),
+    ("ix_submissions_status_submitted_at_id", "submissions", ["status", "submitted_at", "id"]),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
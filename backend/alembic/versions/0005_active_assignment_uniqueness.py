@@ -0,0 +1,56 @@
+"""One active candidate assignment per candidate and assignment
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 11:40:00
+
+A partial unique index over the open statuses lets bulk assignment insert
+with ON CONFLICT DO NOTHING instead of checking each pair first. The index
+cannot be built while duplicates exist, so the upgrade stops and lists them;
+resolve them (e.g. mark the older rows failed) and re-run it.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "uq_candidate_assignments_active_pair"
+ACTIVE_PAIR_WHERE = sa.text("status IN ('assigned', 'in_progress')")
+
+
+def _check_duplicates():
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT candidate_id, assignment_id, count(*) FROM candidate_assignments "
+        "WHERE status IN ('assigned', 'in_progress') "
+        "GROUP BY candidate_id, assignment_id HAVING count(*) > 1"
+    )).fetchall()
+    if duplicates:
+        pairs = ", ".join(f"{row[0]}/{row[1]} ({row[2]} rows)" for row in duplicates[:20])
+        raise RuntimeError(
+            f"{len(duplicates)} candidate/assignment pairs have more than one open row: {pairs}"
+        )
+
+
+def upgrade():
+    if not op.get_context().as_sql:
+        _check_duplicates()
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX_NAME,
+            "candidate_assignments",
+            ["candidate_id", "assignment_id"],
+            unique=True,
+            postgresql_where=ACTIVE_PAIR_WHERE,
+            sqlite_where=ACTIVE_PAIR_WHERE,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX_NAME, table_name="candidate_assignments", postgresql_concurrently=True, if_exists=True)
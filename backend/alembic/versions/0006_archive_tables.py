@@ -0,0 +1,81 @@
+"""Archive tables for finished candidate assignments, submissions and reviews
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 12:20:00
+
+The archive job (python -m app.cli archive-finished) moves completed and
+failed candidate assignments, with their submissions and reviews, into
+these tables so the live tables stay small. Downgrading drops the archive
+tables together with the rows in them.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.types import GUID
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def _archived_at():
+    return sa.Column("archived_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now())
+
+
+def upgrade():
+    op.create_table(
+        "candidate_assignments_archive",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("candidate_id", GUID(), nullable=False),
+        sa.Column("assignment_id", GUID(), nullable=False),
+        sa.Column("assigned_by", GUID(), nullable=False),
+        sa.Column("assigned_at", sa.DateTime(timezone=True)),
+        sa.Column("deadline", sa.DateTime(timezone=True)),
+        sa.Column("status", sa.String(50)),
+        sa.Column("completed_at", sa.DateTime(timezone=True)),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+        sa.Column("progress_percentage", sa.Integer()),
+        sa.Column("notes", sa.String(1000)),
+        _archived_at(),
+    )
+    op.create_index("ix_candidate_assignments_archive_candidate_id", "candidate_assignments_archive", ["candidate_id"])
+    op.create_index("ix_candidate_assignments_archive_assignment_id", "candidate_assignments_archive", ["assignment_id"])
+
+    op.create_table(
+        "submissions_archive",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("candidate_assignment_id", GUID(), nullable=False),
+        sa.Column("submission_type", sa.String(50), nullable=False),
+        sa.Column("submission_url", sa.String(500)),
+        sa.Column("files", sa.JSON()),
+        sa.Column("submitted_at", sa.DateTime(timezone=True)),
+        sa.Column("status", sa.String(50)),
+        sa.Column("notes", sa.Text()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+        _archived_at(),
+    )
+    op.create_index("ix_submissions_archive_candidate_assignment_id", "submissions_archive", ["candidate_assignment_id"])
+
+    op.create_table(
+        "reviews_archive",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("submission_id", GUID(), nullable=False),
+        sa.Column("reviewer_id", GUID(), nullable=False),
+        sa.Column("score", sa.Integer()),
+        sa.Column("feedback", sa.Text()),
+        sa.Column("criteria_scores", sa.JSON()),
+        sa.Column("reviewed_at", sa.DateTime(timezone=True)),
+        sa.Column("status", sa.String(50)),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+        _archived_at(),
+    )
+    op.create_index("ix_reviews_archive_submission_id", "reviews_archive", ["submission_id"])
+
+
+def downgrade():
+    op.drop_table("reviews_archive")
+    op.drop_table("submissions_archive")
+    op.drop_table("candidate_assignments_archive")
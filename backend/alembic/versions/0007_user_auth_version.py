@@ -0,0 +1,26 @@
+"""Per-user auth version stamp
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 13:30:00
+
+Access tokens carry the user's auth_version as the "ver" claim. Changing a
+user's role or deactivating them bumps the version, which invalidates the
+tokens issued before the change.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("users", sa.Column("auth_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade():
+    op.drop_column("users", "auth_version")
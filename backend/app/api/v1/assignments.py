@@ -1,20 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import func
+from typing import List, Optional, Union
 from uuid import UUID
+from datetime import datetime
 
-from ...core.database import get_db
-from ...core.security import get_current_active_user, require_admin, require_reviewer_or_admin
+from ...core.database import get_db, get_read_db
+from ...core.pagination import paginate_query, cursor_page
+from ...core.security import get_current_principal, require_admin, require_reviewer_or_admin
 from ...models.user import User
 from ...models.assignment import Assignment
 from ...models.project import Project
+from ...models.candidate_assignment import CandidateAssignment
+from ...models.rollup import RollupCounter, METRIC_CANDIDATE_ASSIGNMENTS
+from ...models.loading import ASSIGNMENT_WITH_PROJECT
 from ...schemas.assignment import AssignmentCreate, AssignmentUpdate, Assignment as AssignmentSchema, AssignmentWithProject, AssignmentWithStats
+from ...schemas.pagination import CursorPage
 
 router = APIRouter()
 
 
 @router.post("/", response_model=AssignmentSchema)
-async def create_assignment(
+def create_assignment(
     assignment_data: AssignmentCreate,
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db)
@@ -38,19 +45,20 @@ async def create_assignment(
     return db_assignment
 
 
-@router.get("/", response_model=List[AssignmentWithProject])
-async def get_assignments(
+@router.get("/", response_model=Union[CursorPage[AssignmentWithProject], List[AssignmentWithProject]])
+def get_assignments(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Keyset cursor; pass an empty value for the first page"),
     project_id: Optional[UUID] = Query(None),
     skillsets: Optional[List[str]] = Query(None),
     difficulty_level: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_principal),
+    db: Session = Depends(get_read_db)
 ):
     """Get all assignments with optional filtering"""
-    query = db.query(Assignment).join(Project)
+    query = db.query(Assignment).options(*ASSIGNMENT_WITH_PROJECT)
     
     if project_id:
         query = query.filter(Assignment.project_id == project_id)
@@ -63,7 +71,8 @@ async def get_assignments(
     if is_active is not None:
         query = query.filter(Assignment.is_active == is_active)
     
-    assignments = query.offset(skip).limit(limit).all()
+    assignments = paginate_query(query, Assignment.created_at, Assignment.id, skip, limit, cursor).all()
+    assignments, next_cursor = cursor_page(assignments, limit, lambda a: (a.created_at, a.id))
     
     # Add project information
     result = []
@@ -73,13 +82,15 @@ async def get_assignments(
         assignment_dict.project_domain = assignment.project.domain
         result.append(assignment_dict)
     
+    if cursor is not None:
+        return {"items": result, "next_cursor": next_cursor}
     return result
 
 
 @router.get("/{assignment_id}", response_model=AssignmentWithProject)
-async def get_assignment(
+def get_assignment(
     assignment_id: UUID,
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Get a specific assignment by ID"""
@@ -98,7 +109,7 @@ async def get_assignment(
 
 
 @router.put("/{assignment_id}", response_model=AssignmentSchema)
-async def update_assignment(
+def update_assignment(
     assignment_id: UUID,
     assignment_data: AssignmentUpdate,
     current_user: User = Depends(require_admin),
@@ -122,7 +133,7 @@ async def update_assignment(
 
 
 @router.delete("/{assignment_id}")
-async def delete_assignment(
+def delete_assignment(
     assignment_id: UUID,
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db)
@@ -142,10 +153,10 @@ async def delete_assignment(
 
 
 @router.get("/{assignment_id}/stats", response_model=AssignmentWithStats)
-async def get_assignment_stats(
+def get_assignment_stats(
     assignment_id: UUID,
     current_user: User = Depends(require_reviewer_or_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get assignment statistics"""
     assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
@@ -155,12 +166,24 @@ async def get_assignment_stats(
             detail="Assignment not found"
         )
     
-    # Calculate stats
-    candidate_assignments = assignment.candidate_assignments
-    total_candidates = len(candidate_assignments)
-    completed_count = len([ca for ca in candidate_assignments if ca.status == "completed"])
-    in_progress_count = len([ca for ca in candidate_assignments if ca.status == "in_progress"])
-    overdue_count = len([ca for ca in candidate_assignments if ca.is_overdue])
+    # Calculate stats from the rollup counters
+    status_counts = dict(
+        db.query(RollupCounter.status, func.sum(RollupCounter.value))
+        .filter(
+            RollupCounter.metric == METRIC_CANDIDATE_ASSIGNMENTS,
+            RollupCounter.assignment_id == assignment_id
+        )
+        .group_by(RollupCounter.status)
+        .all()
+    )
+    total_candidates = sum(status_counts.values())
+    completed_count = status_counts.get("completed", 0)
+    in_progress_count = status_counts.get("in_progress", 0)
+    overdue_count = db.query(func.count(CandidateAssignment.id)).filter(
+        CandidateAssignment.assignment_id == assignment_id,
+        CandidateAssignment.deadline < datetime.utcnow(),
+        CandidateAssignment.status.in_(["assigned", "in_progress"])
+    ).scalar()
     
     assignment_dict = AssignmentWithStats.from_orm(assignment)
     assignment_dict.total_candidates = total_candidates
@@ -172,9 +195,9 @@ async def get_assignment_stats(
 
 
 @router.get("/skillsets/list")
-async def get_assignment_skillsets(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+def get_assignment_skillsets(
+    current_user: User = Depends(get_current_principal),
+    db: Session = Depends(get_read_db)
 ):
     """Get list of all assignment skillsets"""
     skillsets = db.query(Assignment.skillsets).filter(
@@ -1,15 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from typing import Optional
+from uuid import UUID
 
-from ...core.database import get_db
+from ...core.database import get_async_db
 from ...core.security import (
-    verify_password, get_password_hash, create_access_token, 
-    create_refresh_token, get_current_user
+    verify_password_async, get_password_hash_async, create_access_token, access_token_claims,
+    create_refresh_token, get_current_user, verify_token, new_token_family, revoke_token, is_token_revoked
 )
 from ...core.config import settings
+from ...core.rate_limit import login_email_limit, login_ip_limit, refresh_limit, register_limit
+from ...core.revocation import revocation_store
 from ...models.user import User
 from ...schemas.user import UserCreate, User as UserSchema, UserLogin, Token
 
@@ -17,11 +21,11 @@ router = APIRouter()
 security = HTTPBearer()
 
 
-@router.post("/register", response_model=UserSchema)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+@router.post("/register", response_model=UserSchema, dependencies=[Depends(register_limit)])
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user"""
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -29,26 +33,29 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     db_user = User(
         email=user_data.email,
         full_name=user_data.full_name,
+        password_hash=hashed_password,
         role=user_data.role,
         skillsets=user_data.skillsets
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 
-@router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+@router.post(
+    "/login", response_model=Token, dependencies=[Depends(login_ip_limit), Depends(login_email_limit)]
+)
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Login user and return access token"""
     # Find user by email
-    user = db.query(User).filter(User.email == user_credentials.email).first()
+    user = await db.scalar(select(User).where(User.email == user_credentials.email))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -56,7 +63,7 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
         )
     
     # Verify password
-    if not verify_password(user_credentials.password, user.password_hash):
+    if not await verify_password_async(user_credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -70,13 +77,14 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
         )
     
     # Create tokens
+    family = new_token_family()
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email, "role": user.role},
+        data=access_token_claims(user, family),
         expires_delta=access_token_expires
     )
     refresh_token = create_refresh_token(
-        data={"sub": str(user.id), "email": user.email}
+        data={"sub": str(user.id), "email": user.email, "fam": family}
     )
     
     return {
@@ -87,36 +95,45 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     }
 
 
-@router.post("/refresh", response_model=Token)
+@router.post("/refresh", response_model=Token, dependencies=[Depends(refresh_limit)])
 async def refresh_token(
     refresh_token: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Refresh access token using refresh token"""
     # Verify refresh token
     payload = verify_token(refresh_token)
-    if not payload or payload.get("type") != "refresh":
+    if not payload or payload.get("type") != "refresh" or await is_token_revoked(payload):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token"
         )
     
-    user_id = payload.get("sub")
-    user = db.query(User).filter(User.id == user_id).first()
+    # Each refresh token is good for one rotation; a second use means it
+    # leaked, so end the whole login for both holders
+    if payload.get("jti") and not await revocation_store.claim_refresh_token(payload["jti"], payload["exp"]):
+        revoke_token(payload)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token reuse detected"
+        )
+    
+    user = await db.get(User, UUID(payload["sub"]))
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token"
         )
     
-    # Create new access token
+    # Create new access token in the same token family
+    family = payload.get("fam") or new_token_family()
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email, "role": user.role},
+        data=access_token_claims(user, family),
         expires_delta=access_token_expires
     )
     new_refresh_token = create_refresh_token(
-        data={"sub": str(user.id), "email": user.email}
+        data={"sub": str(user.id), "email": user.email, "fam": family}
     )
     
     return {
@@ -134,6 +151,22 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 
 
 @router.post("/logout")
-async def logout():
-    """Logout user (client should discard tokens)"""
+async def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    refresh_token: Optional[str] = None
+):
+    """Logout user: revoke the access token and every token of its login"""
+    payload = verify_token(credentials.credentials)
+    if payload is None or payload.get("type") == "refresh":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials"
+        )
+    revoke_token(payload)
+    
+    # Tokens issued before token families existed can only be revoked one by one
+    refresh_payload = verify_token(refresh_token) if refresh_token else None
+    if refresh_payload and refresh_payload.get("type") == "refresh" and refresh_payload.get("sub") == payload.get("sub"):
+        revoke_token(refresh_payload)
+    
     return {"message": "Successfully logged out"} 
\ No newline at end of file
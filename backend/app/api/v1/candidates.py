@@ -1,22 +1,35 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 from uuid import UUID
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import uuid
 
-from ...core.database import get_db
-from ...core.security import get_current_active_user, require_admin, require_reviewer_or_admin
+from ...core.database import dialect_insert, get_db, get_read_db
+from ...core.pagination import paginate_query, cursor_page
+from ...core.security import get_current_active_user, get_current_principal, require_admin, require_reviewer_or_admin
 from ...models.user import User
-from ...models.candidate_assignment import CandidateAssignment
+from ...models.candidate_assignment import CandidateAssignment, ACTIVE_PAIR_WHERE
 from ...models.assignment import Assignment
 from ...models.submission import Submission
+from ...models.loading import CANDIDATE_ASSIGNMENT_LIST, CANDIDATE_ASSIGNMENT_HISTORY
+from ...schemas.assignment import BulkAssignmentCreate
 from ...schemas.user import User as UserSchema
+from ...schemas.pagination import CursorPage
+from ...services.archive_service import archived_assignment_history
+from ...services.rollup_service import (
+    record_assignment_created, record_assignments_created, record_status_change
+)
 
 router = APIRouter()
 
+# Candidate/assignment pairs a single bulk request may create
+MAX_BULK_ASSIGNMENTS = 5000
+
 
 @router.post("/{candidate_id}/assign/{assignment_id}")
-async def assign_assignment_to_candidate(
+def assign_assignment_to_candidate(
     candidate_id: UUID,
     assignment_id: UUID,
     deadline_days: int = Query(7, ge=1, le=30),
@@ -70,6 +83,16 @@ async def assign_assignment_to_candidate(
     )
     
     db.add(candidate_assignment)
+    try:
+        db.flush()
+    except IntegrityError:
+        # A concurrent request created the open row after the check above
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Assignment already assigned to this candidate"
+        )
+    record_assignment_created(db, candidate_assignment, assignment.project_id)
     db.commit()
     db.refresh(candidate_assignment)
     
@@ -80,17 +103,113 @@ async def assign_assignment_to_candidate(
     }
 
 
-@router.get("/assignments", response_model=List[dict])
-async def get_candidate_assignments(
+@router.post("/assign/bulk")
+def bulk_assign_assignments(
+    request: BulkAssignmentCreate,
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Assign assignments to many candidates at once.
+    
+    Every requested candidate/assignment pair gets an outcome: ``assigned``,
+    ``already_assigned`` (an open row exists), ``candidate_not_found`` or
+    ``assignment_not_found``. Candidates selected by skillsets are the ones
+    that matched, so they are never reported as not found.
+    """
+    assignments = dict(db.query(Assignment.id, Assignment.project_id).filter(
+        Assignment.id.in_(request.assignment_ids),
+        Assignment.is_active == True
+    ).all())
+    
+    candidate_query = db.query(User.id).filter(User.role == "candidate")
+    if request.candidate_ids is not None:
+        candidate_query = candidate_query.filter(User.id.in_(request.candidate_ids))
+        candidate_ids = list(dict.fromkeys(request.candidate_ids))
+    else:
+        for skillset in request.skillsets:
+            candidate_query = candidate_query.filter(User.skillsets.contains([skillset]))
+    found_candidates = {candidate_id for candidate_id, in candidate_query.all()}
+    if request.skillsets is not None:
+        candidate_ids = sorted(found_candidates, key=str)
+    
+    assignment_ids = list(dict.fromkeys(request.assignment_ids))
+    if len(candidate_ids) * len(assignment_ids) > MAX_BULK_ASSIGNMENTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bulk requests are limited to {MAX_BULK_ASSIGNMENTS} candidate/assignment pairs"
+        )
+    
+    now = datetime.now(timezone.utc)
+    deadline = now + timedelta(days=request.deadline_days)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "candidate_id": candidate_id,
+            "assignment_id": assignment_id,
+            "assigned_by": current_user.id,
+            "assigned_at": now,
+            "deadline": deadline,
+            "status": "assigned",
+            "progress_percentage": 0,
+            "notes": request.notes,
+        }
+        for candidate_id in candidate_ids if candidate_id in found_candidates
+        for assignment_id in assignment_ids if assignment_id in assignments
+    ]
+    
+    created = {}
+    if rows:
+        # Pairs that already have an open row hit the partial unique index and are skipped
+        stmt = dialect_insert(db, CandidateAssignment).on_conflict_do_nothing(
+            index_elements=["candidate_id", "assignment_id"],
+            index_where=ACTIVE_PAIR_WHERE,
+        ).returning(
+            CandidateAssignment.id, CandidateAssignment.candidate_id, CandidateAssignment.assignment_id
+        )
+        created = {
+            (row.candidate_id, row.assignment_id): row.id
+            for row in db.execute(stmt, rows)
+        }
+        record_assignments_created(
+            db, [(assignment_id, assignments[assignment_id], now) for _, assignment_id in created]
+        )
+    db.commit()
+    
+    results = []
+    for candidate_id in candidate_ids:
+        for assignment_id in assignment_ids:
+            result = {"candidate_id": candidate_id, "assignment_id": assignment_id}
+            if candidate_id not in found_candidates:
+                result["status"] = "candidate_not_found"
+            elif assignment_id not in assignments:
+                result["status"] = "assignment_not_found"
+            elif (candidate_id, assignment_id) in created:
+                result["status"] = "assigned"
+                result["candidate_assignment_id"] = created[(candidate_id, assignment_id)]
+            else:
+                result["status"] = "already_assigned"
+            results.append(result)
+    
+    return {
+        "assigned": len(created),
+        "skipped": len(results) - len(created),
+        "deadline": deadline,
+        "results": results
+    }
+
+
+@router.get("/assignments", response_model=Union[CursorPage[dict], List[dict]])
+def get_candidate_assignments(
     candidate_id: Optional[UUID] = Query(None),
     status: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Keyset cursor; pass an empty value for the first page"),
+    current_user: User = Depends(get_current_principal),
+    db: Session = Depends(get_read_db)
 ):
     """Get candidate assignments"""
-    query = db.query(CandidateAssignment).join(Assignment).join(User, User.id == CandidateAssignment.candidate_id)
+    query = db.query(CandidateAssignment).options(*CANDIDATE_ASSIGNMENT_LIST)
     
     # Filter by candidate if specified (or show current user's assignments if candidate)
     if candidate_id:
@@ -106,7 +225,10 @@ async def get_candidate_assignments(
     if status:
         query = query.filter(CandidateAssignment.status == status)
     
-    assignments = query.offset(skip).limit(limit).all()
+    assignments = paginate_query(
+        query, CandidateAssignment.assigned_at, CandidateAssignment.id, skip, limit, cursor
+    ).all()
+    assignments, next_cursor = cursor_page(assignments, limit, lambda ca: (ca.assigned_at, ca.id))
     
     result = []
     for ca in assignments:
@@ -125,11 +247,13 @@ async def get_candidate_assignments(
             "notes": ca.notes
         })
     
+    if cursor is not None:
+        return {"items": result, "next_cursor": next_cursor}
     return result
 
 
 @router.put("/assignments/{assignment_id}/status")
-async def update_assignment_status(
+def update_assignment_status(
     assignment_id: UUID,
     status: str,
     progress_percentage: Optional[int] = Query(None, ge=0, le=100),
@@ -148,6 +272,8 @@ async def update_assignment_status(
             detail="Assignment not found"
         )
     
+    old_status = candidate_assignment.status
+    
     # Check permissions
     if current_user.role == "candidate":
         if candidate_assignment.candidate_id != current_user.id:
@@ -156,7 +282,7 @@ async def update_assignment_status(
                 detail="Can only update own assignments"
             )
         # Candidates can only update status and progress
-        candidate_assignment.status = status
+        candidate_assignment.set_status(status)
         if progress_percentage is not None:
             candidate_assignment.progress_percentage = progress_percentage
     else:
@@ -164,21 +290,23 @@ async def update_assignment_status(
         if notes is not None:
             candidate_assignment.notes = notes
         if status is not None:
-            candidate_assignment.status = status
+            candidate_assignment.set_status(status)
     
+    record_status_change(db, candidate_assignment, old_status)
     db.commit()
     db.refresh(candidate_assignment)
     
     return {"message": "Assignment status updated successfully"}
 
 
-@router.get("/candidates", response_model=List[UserSchema])
-async def get_candidates(
+@router.get("/candidates", response_model=Union[CursorPage[UserSchema], List[UserSchema]])
+def get_candidates(
     skillsets: Optional[List[str]] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Keyset cursor; pass an empty value for the first page"),
     current_user: User = Depends(require_reviewer_or_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all candidates with optional filtering"""
     query = db.query(User).filter(User.role == "candidate")
@@ -187,15 +315,19 @@ async def get_candidates(
         for skillset in skillsets:
             query = query.filter(User.skillsets.contains([skillset]))
     
-    candidates = query.offset(skip).limit(limit).all()
+    candidates = paginate_query(query, User.created_at, User.id, skip, limit, cursor).all()
+    candidates, next_cursor = cursor_page(candidates, limit, lambda user: (user.created_at, user.id))
+    
+    if cursor is not None:
+        return {"items": candidates, "next_cursor": next_cursor}
     return candidates
 
 
 @router.get("/candidates/{candidate_id}/assignments")
-async def get_candidate_assignment_history(
+def get_candidate_assignment_history(
     candidate_id: UUID,
     current_user: User = Depends(require_reviewer_or_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get detailed assignment history for a candidate"""
     candidate = db.query(User).filter(
@@ -209,9 +341,9 @@ async def get_candidate_assignment_history(
             detail="Candidate not found"
         )
     
-    assignments = db.query(CandidateAssignment).filter(
+    assignments = db.query(CandidateAssignment).options(*CANDIDATE_ASSIGNMENT_HISTORY).filter(
         CandidateAssignment.candidate_id == candidate_id
-    ).join(Assignment).all()
+    ).all()
     
     result = []
     for ca in assignments:
@@ -240,6 +372,30 @@ async def get_candidate_assignment_history(
         
         result.append(assignment_data)
     
+    # Finished assignments moved out of the live tables
+    for ca, submissions in archived_assignment_history(db, candidate_id):
+        result.append({
+            "assignment_id": ca.assignment_id,
+            "assignment_title": ca.title,
+            "project_name": ca.name,
+            "status": ca.status,
+            "progress_percentage": ca.progress_percentage,
+            "assigned_at": ca.assigned_at,
+            "deadline": ca.deadline,
+            "is_overdue": False,
+            "notes": ca.notes,
+            "submissions": [
+                {
+                    "id": submission.id,
+                    "type": submission.submission_type,
+                    "status": submission.status,
+                    "submitted_at": submission.submitted_at,
+                    "notes": submission.notes
+                }
+                for submission in submissions
+            ]
+        })
+    
     return {
         "candidate": {
             "id": candidate.id,
@@ -1,29 +1,35 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 from uuid import UUID
 import uuid
 
-from ...core.database import get_db
-from ...core.security import get_current_active_user, require_admin
+from ...core.database import get_db, get_read_db
+from ...core.rate_limit import certificate_limit
+from ...core.pagination import paginate_query, cursor_page
+from ...core.security import get_current_principal, require_admin
 from ...models.user import User
 from ...models.certificate import Certificate
 from ...models.candidate_assignment import CandidateAssignment
 from ...models.review import Review
+from ...models.submission import Submission
+from ...models.loading import CANDIDATE_ASSIGNMENT_CERTIFICATE, CERTIFICATE_DETAIL
+from ...schemas.pagination import CursorPage
 from ...services.certificate_service import generate_certificate_pdf
+from ...services.rollup_service import record_certificate
 
 router = APIRouter()
 
 
-@router.post("/generate/{candidate_assignment_id}")
-async def generate_certificate(
+@router.post("/generate/{candidate_assignment_id}", dependencies=[Depends(certificate_limit)])
+def generate_certificate(
     candidate_assignment_id: UUID,
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
     """Generate a certificate for a completed assignment"""
     # Check if candidate assignment exists and is completed
-    candidate_assignment = db.query(CandidateAssignment).filter(
+    candidate_assignment = db.query(CandidateAssignment).options(*CANDIDATE_ASSIGNMENT_CERTIFICATE).filter(
         CandidateAssignment.id == candidate_assignment_id,
         CandidateAssignment.status == "completed"
     ).first()
@@ -65,7 +71,7 @@ async def generate_certificate(
     
     # Generate PDF
     try:
-        pdf_url = await generate_certificate_pdf(
+        pdf_url = generate_certificate_pdf(
             candidate=candidate_assignment.candidate,
             assignment=candidate_assignment.assignment,
             score=best_score,
@@ -88,6 +94,7 @@ async def generate_certificate(
     )
     
     db.add(certificate)
+    record_certificate(db, certificate, candidate_assignment.assignment.project_id)
     db.commit()
     db.refresh(certificate)
     
@@ -99,17 +106,18 @@ async def generate_certificate(
     }
 
 
-@router.get("/", response_model=List[dict])
-async def get_certificates(
+@router.get("/", response_model=Union[CursorPage[dict], List[dict]])
+def get_certificates(
     candidate_id: Optional[UUID] = Query(None),
     assignment_id: Optional[UUID] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Keyset cursor; pass an empty value for the first page"),
+    current_user: User = Depends(get_current_principal),
+    db: Session = Depends(get_read_db)
 ):
     """Get certificates with optional filtering"""
-    query = db.query(Certificate).join(User).join(Assignment)
+    query = db.query(Certificate).options(*CERTIFICATE_DETAIL)
     
     # Filter by candidate if specified
     if candidate_id:
@@ -125,7 +133,8 @@ async def get_certificates(
     if assignment_id:
         query = query.filter(Certificate.assignment_id == assignment_id)
     
-    certificates = query.offset(skip).limit(limit).all()
+    certificates = paginate_query(query, Certificate.issued_at, Certificate.id, skip, limit, cursor).all()
+    certificates, next_cursor = cursor_page(certificates, limit, lambda cert: (cert.issued_at, cert.id))
     
     result = []
     for cert in certificates:
@@ -143,17 +152,19 @@ async def get_certificates(
             "is_passing": cert.is_passing_score
         })
     
+    if cursor is not None:
+        return {"items": result, "next_cursor": next_cursor}
     return result
 
 
 @router.get("/{certificate_id}")
-async def get_certificate(
+def get_certificate(
     certificate_id: UUID,
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Get a specific certificate"""
-    certificate = db.query(Certificate).filter(Certificate.id == certificate_id).first()
+    certificate = db.query(Certificate).options(*CERTIFICATE_DETAIL).filter(Certificate.id == certificate_id).first()
     if not certificate:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -183,7 +194,7 @@ async def get_certificate(
 
 
 @router.delete("/{certificate_id}")
-async def delete_certificate(
+def delete_certificate(
     certificate_id: UUID,
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db)
@@ -196,19 +207,21 @@ async def delete_certificate(
             detail="Certificate not found"
         )
     
-    certificate.is_active = False
+    if certificate.is_active:
+        certificate.is_active = False
+        record_certificate(db, certificate, certificate.assignment.project_id, delta=-1)
     db.commit()
     
     return {"message": "Certificate deleted successfully"}
 
 
 @router.get("/verify/{certificate_number}")
-async def verify_certificate(
+def verify_certificate(
     certificate_number: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Verify a certificate by number (public endpoint)"""
-    certificate = db.query(Certificate).filter(
+    certificate = db.query(Certificate).options(*CERTIFICATE_DETAIL).filter(
         Certificate.certificate_number == certificate_number,
         Certificate.is_active == True
     ).first()
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends
+
+from ...core.config import DATABASE_CONFIG
+from ...core.pool_metrics import pool_metrics_snapshot
+from ...core.security import password_pool, require_admin
+from ...core.sql_metrics import route_query_stats
+from ...models.user import User
+
+router = APIRouter()
+
+
+@router.get("/db-pool")
+def get_db_pool_metrics(
+    current_user: User = Depends(require_admin)
+):
+    """Connection pool usage since startup for every engine of this process"""
+    return {
+        "config": {
+            key: DATABASE_CONFIG[key]
+            for key in ("pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping")
+        },
+        "pools": pool_metrics_snapshot()
+    }
+
+
+@router.get("/sql-routes")
+def get_sql_route_metrics(
+    current_user: User = Depends(require_admin)
+):
+    """Query count and database time per route since startup"""
+    return route_query_stats()
+
+
+@router.get("/password-pool")
+def get_password_pool_metrics(
+    current_user: User = Depends(require_admin)
+):
+    """Password hashing pool occupancy and rejections since startup"""
+    return password_pool.snapshot()
@@ -1,13 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
 from uuid import UUID
 
-from ...core.database import get_db
-from ...core.security import get_current_active_user, require_admin
+from ...core.database import get_async_db
+from ...core.pagination import paginate_query, cursor_page
+from ...core.security import get_current_principal, require_admin
 from ...models.user import User
 from ...models.project import Project
+from ...models.assignment import Assignment
 from ...schemas.project import ProjectCreate, ProjectUpdate, Project as ProjectSchema, ProjectWithAssignments
+from ...schemas.pagination import CursorPage
 
 router = APIRouter()
 
@@ -16,56 +20,63 @@ router = APIRouter()
 async def create_project(
     project_data: ProjectCreate,
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new project"""
     db_project = Project(**project_data.dict())
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
     return db_project
 
 
-@router.get("/", response_model=List[ProjectWithAssignments])
+@router.get("/", response_model=Union[CursorPage[ProjectWithAssignments], List[ProjectWithAssignments]])
 async def get_projects(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Keyset cursor; pass an empty value for the first page"),
     domain: Optional[str] = Query(None),
     difficulty_level: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all projects with optional filtering"""
-    query = db.query(Project)
+    assignments_count = select(func.count(Assignment.id)).where(
+        Assignment.project_id == Project.id
+    ).scalar_subquery()
+    query = select(Project, assignments_count.label("assignments_count"))
     
     if domain:
-        query = query.filter(Project.domain == domain)
+        query = query.where(Project.domain == domain)
     if difficulty_level:
-        query = query.filter(Project.difficulty_level == difficulty_level)
+        query = query.where(Project.difficulty_level == difficulty_level)
     if is_active is not None:
-        query = query.filter(Project.is_active == is_active)
+        query = query.where(Project.is_active == is_active)
     
-    projects = query.offset(skip).limit(limit).all()
+    rows = (await db.execute(paginate_query(query, Project.created_at, Project.id, skip, limit, cursor))).all()
+    rows, next_cursor = cursor_page(rows, limit, lambda row: (row[0].created_at, row[0].id))
     
     # Add assignment counts
     result = []
-    for project in projects:
+    for project, count in rows:
         project_dict = ProjectWithAssignments.from_orm(project)
-        project_dict.assignments_count = len(project.assignments)
+        project_dict.assignments_count = count
         result.append(project_dict)
     
+    if cursor is not None:
+        return {"items": result, "next_cursor": next_cursor}
     return result
 
 
 @router.get("/{project_id}", response_model=ProjectSchema)
 async def get_project(
     project_id: UUID,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific project by ID"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -79,10 +90,10 @@ async def update_project(
     project_id: UUID,
     project_data: ProjectUpdate,
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a project"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -93,8 +104,8 @@ async def update_project(
     for field, value in update_data.items():
         setattr(project, field, value)
     
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await db.refresh(project)
     return project
 
 
@@ -102,10 +113,10 @@ async def update_project(
 async def delete_project(
     project_id: UUID,
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a project (soft delete by setting is_active=False)"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -113,19 +124,21 @@ async def delete_project(
         )
     
     project.is_active = False
-    db.commit()
+    await db.commit()
     
     return {"message": "Project deleted successfully"}
 
 
 @router.get("/domains/list")
 async def get_project_domains(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get list of all project domains"""
-    domains = db.query(Project.domain).filter(
-        Project.domain.isnot(None),
-        Project.is_active == True
-    ).distinct().all()
-    return [domain[0] for domain in domains if domain[0]] 
\ No newline at end of file
+    domains = await db.scalars(
+        select(Project.domain).where(
+            Project.domain.isnot(None),
+            Project.is_active == True
+        ).distinct()
+    )
+    return [domain for domain in domains if domain] 
\ No newline at end of file
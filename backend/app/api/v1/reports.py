@@ -1,299 +1,380 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+import os
+import tempfile
 from uuid import UUID
 
-from ...core.database import get_db
-from ...core.security import get_current_active_user, require_admin
+from ...core.cache import get_or_compute
+from ...core.config import settings
+from ...core.database import get_read_db
+from ...core.security import require_admin
 from ...models.user import User
 from ...models.assignment import Assignment
+from ...models.archive import with_archived
 from ...models.candidate_assignment import CandidateAssignment
-from ...models.review import Review
-from ...models.certificate import Certificate
+from ...models.certificate import PASSING_SCORE
 from ...models.project import Project
+from ...models.activity import ACTIVITY_METRICS
+from ...models.rollup import RollupCounter, METRIC_CANDIDATE_ASSIGNMENTS, METRIC_CERTIFICATES
+from ...schemas.report import (
+    ReportJobCreate, EXPORT_FORMAT_PATTERN, PERFORMANCE_DEFAULT_LIMIT, PERFORMANCE_MAX_LIMIT
+)
+from ...services.export_service import EXPORT_TABLES, export_table
+from ...services.report_jobs import submit_report_job, get_report_job, get_report_result
+from ...services.report_service import (
+    candidate_performance, projects_summary,
+    iter_candidate_export_rows, encode_csv, encode_ndjson, gzip_chunks
+)
+from ...services.rollup_service import sum_counter_value
+from ...services.score_analytics import load_scores, summarize_scores
+from ...services.timeseries_service import get_activity_series, get_last_refreshed_at
 
 router = APIRouter()
 
+DASHBOARD_CACHE_KEY = "reports:dashboard"
+
 
 @router.get("/dashboard")
-async def get_dashboard_stats(
+def get_dashboard_stats(
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get dashboard statistics"""
+    return get_or_compute(
+        DASHBOARD_CACHE_KEY,
+        settings.DASHBOARD_CACHE_TTL_SECONDS,
+        lambda: _compute_dashboard_stats(db)
+    )
+
+
+def _compute_dashboard_stats(db: Session) -> dict:
+    """Compute dashboard statistics from the rollup counters"""
+    now = datetime.utcnow()
+    thirty_days_ago = (now - timedelta(days=30)).date()
+    
     # Total counts
-    total_projects = db.query(Project).filter(Project.is_active == True).count()
-    total_assignments = db.query(Assignment).filter(Assignment.is_active == True).count()
-    total_candidates = db.query(User).filter(User.role == "candidate").count()
-    total_reviewers = db.query(User).filter(User.role == "reviewer").count()
+    overview = db.query(
+        func.count(User.id).filter(User.role == "candidate").label("total_candidates"),
+        func.count(User.id).filter(User.role == "reviewer").label("total_reviewers"),
+        db.query(func.count(Project.id)).filter(Project.is_active == True)
+            .scalar_subquery().label("total_projects"),
+        db.query(func.count(Assignment.id)).filter(Assignment.is_active == True)
+            .scalar_subquery().label("total_assignments"),
+    ).one()
     
-    # Assignment statistics
-    total_assigned = db.query(CandidateAssignment).count()
-    completed_assignments = db.query(CandidateAssignment).filter(
-        CandidateAssignment.status == "completed"
-    ).count()
-    in_progress_assignments = db.query(CandidateAssignment).filter(
-        CandidateAssignment.status == "in_progress"
-    ).count()
-    overdue_assignments = db.query(CandidateAssignment).filter(
-        and_(
-            CandidateAssignment.deadline < datetime.utcnow(),
+    # Assignment, certificate and recent activity (last 30 days) counters.
+    # Overdue depends on the current time, so it is counted from the live table.
+    is_assignment = RollupCounter.metric == METRIC_CANDIDATE_ASSIGNMENTS
+    is_certificate = RollupCounter.metric == METRIC_CERTIFICATES
+    activity = db.query(
+        sum_counter_value(is_assignment).label("total_assigned"),
+        sum_counter_value(is_assignment, RollupCounter.status == "completed").label("completed"),
+        sum_counter_value(is_assignment, RollupCounter.status == "in_progress").label("in_progress"),
+        sum_counter_value(is_assignment, RollupCounter.day >= thirty_days_ago).label("recent_assignments"),
+        sum_counter_value(
+            is_assignment,
+            RollupCounter.status == "completed",
+            RollupCounter.day >= thirty_days_ago
+        ).label("recent_completions"),
+        sum_counter_value(is_certificate).label("total_certificates"),
+        sum_counter_value(is_certificate, RollupCounter.status == "passing").label("passing_certificates"),
+        db.query(func.count(CandidateAssignment.id)).filter(
+            CandidateAssignment.deadline < now,
             CandidateAssignment.status.in_(["assigned", "in_progress"])
-        )
-    ).count()
-    
-    # Certificate statistics
-    total_certificates = db.query(Certificate).filter(Certificate.is_active == True).count()
-    passing_certificates = db.query(Certificate).filter(
-        and_(
-            Certificate.is_active == True,
-            Certificate.score >= 70
-        )
-    ).count()
+        ).scalar_subquery().label("overdue"),
+    ).one()
     
-    # Recent activity (last 30 days)
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    recent_assignments = db.query(CandidateAssignment).filter(
-        CandidateAssignment.assigned_at >= thirty_days_ago
-    ).count()
-    recent_completions = db.query(CandidateAssignment).filter(
-        and_(
-            CandidateAssignment.status == "completed",
-            CandidateAssignment.assigned_at >= thirty_days_ago
-        )
-    ).count()
+    total_assigned = activity.total_assigned
+    total_certificates = activity.total_certificates
     
     return {
         "overview": {
-            "total_projects": total_projects,
-            "total_assignments": total_assignments,
-            "total_candidates": total_candidates,
-            "total_reviewers": total_reviewers
+            "total_projects": overview.total_projects,
+            "total_assignments": overview.total_assignments,
+            "total_candidates": overview.total_candidates,
+            "total_reviewers": overview.total_reviewers
         },
         "assignments": {
             "total_assigned": total_assigned,
-            "completed": completed_assignments,
-            "in_progress": in_progress_assignments,
-            "overdue": overdue_assignments,
-            "completion_rate": round((completed_assignments / total_assigned * 100) if total_assigned > 0 else 0, 2)
+            "completed": activity.completed,
+            "in_progress": activity.in_progress,
+            "overdue": activity.overdue,
+            "completion_rate": round((activity.completed / total_assigned * 100) if total_assigned > 0 else 0, 2)
         },
         "certificates": {
             "total_issued": total_certificates,
-            "passing": passing_certificates,
-            "pass_rate": round((passing_certificates / total_certificates * 100) if total_certificates > 0 else 0, 2)
+            "passing": activity.passing_certificates,
+            "pass_rate": round((activity.passing_certificates / total_certificates * 100) if total_certificates > 0 else 0, 2)
         },
         "recent_activity": {
-            "new_assignments_30d": recent_assignments,
-            "completions_30d": recent_completions
-        }
+            "new_assignments_30d": activity.recent_assignments,
+            "completions_30d": activity.recent_completions
+        },
+        "generated_at": now.isoformat()
     }
 
 
 @router.get("/assignments/analytics")
-async def get_assignment_analytics(
+def get_assignment_analytics(
     project_id: Optional[UUID] = Query(None),
     skillset: Optional[str] = Query(None),
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get assignment analytics"""
-    query = db.query(CandidateAssignment).join(Assignment)
-    
+    # Finished assignments may have been archived; analytics cover them too
+    candidate_assignments = with_archived(CandidateAssignment)
+    from_clause = candidate_assignments.join(
+        Assignment, Assignment.id == candidate_assignments.c.assignment_id
+    )
+    filters = []
     if project_id:
-        query = query.filter(Assignment.project_id == project_id)
+        filters.append(Assignment.project_id == project_id)
     if skillset:
-        query = query.filter(Assignment.skillsets.contains([skillset]))
+        filters.append(Assignment.skillsets.contains([skillset]))
     if start_date:
-        query = query.filter(CandidateAssignment.assigned_at >= start_date)
+        filters.append(candidate_assignments.c.assigned_at >= start_date)
     if end_date:
-        query = query.filter(CandidateAssignment.assigned_at <= end_date)
-    
-    assignments = query.all()
+        filters.append(candidate_assignments.c.assigned_at <= end_date)
     
-    # Calculate statistics
-    total = len(assignments)
-    status_counts = {}
-    difficulty_counts = {}
-    avg_completion_time = 0
-    completion_times = []
+    # Status and difficulty distributions
+    status_counts = dict(
+        db.query(candidate_assignments.c.status, func.count(candidate_assignments.c.id))
+        .select_from(from_clause)
+        .filter(*filters)
+        .group_by(candidate_assignments.c.status)
+        .all()
+    )
+    difficulty_counts = dict(
+        db.query(Assignment.difficulty_level, func.count(candidate_assignments.c.id))
+        .select_from(from_clause)
+        .filter(*filters)
+        .group_by(Assignment.difficulty_level)
+        .all()
+    )
+    total = sum(status_counts.values())
     
-    for assignment in assignments:
-        # Status counts
-        status = assignment.status
-        status_counts[status] = status_counts.get(status, 0) + 1
-        
-        # Difficulty counts
-        difficulty = assignment.assignment.difficulty_level
-        difficulty_counts[difficulty] = difficulty_counts.get(difficulty, 0) + 1
-        
-        # Completion time for completed assignments
-        if assignment.status == "completed":
-            completion_time = (assignment.assigned_at - assignment.assigned_at).days
-            completion_times.append(completion_time)
-    
-    if completion_times:
-        avg_completion_time = sum(completion_times) / len(completion_times)
+    # Completion time in days for completed assignments
+    completion_days = func.extract(
+        "epoch", candidate_assignments.c.completed_at - candidate_assignments.c.assigned_at
+    ) / 86400
+    completion = db.query(
+        func.avg(completion_days).label("average"),
+        func.percentile_cont(0.5).within_group(completion_days).label("p50"),
+        func.percentile_cont(0.9).within_group(completion_days).label("p90"),
+        func.percentile_cont(0.95).within_group(completion_days).label("p95"),
+    ).select_from(from_clause).filter(
+        *filters,
+        candidate_assignments.c.status == "completed",
+        candidate_assignments.c.completed_at.isnot(None)
+    ).one()
     
     return {
         "total_assignments": total,
         "status_distribution": status_counts,
         "difficulty_distribution": difficulty_counts,
-        "average_completion_time_days": round(avg_completion_time, 2),
+        "average_completion_time_days": round(float(completion.average or 0), 2),
+        "completion_time_percentiles_days": {
+            "p50": round(float(completion.p50 or 0), 2),
+            "p90": round(float(completion.p90 or 0), 2),
+            "p95": round(float(completion.p95 or 0), 2)
+        },
         "completion_rate": round((status_counts.get("completed", 0) / total * 100) if total > 0 else 0, 2)
     }
 
 
-@router.get("/candidates/performance")
-async def get_candidate_performance(
+@router.get("/timeseries")
+def get_activity_timeseries(
+    metrics: List[str] = Query(ACTIVITY_METRICS),
+    granularity: str = Query("day", regex="^(day|week|month)$"),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    project_id: Optional[UUID] = Query(None),
     skillset: Optional[str] = Query(None),
-    min_assignments: int = Query(1, ge=1),
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Get candidate performance analytics"""
-    # Get candidates with their assignment history
-    query = db.query(User).filter(User.role == "candidate")
-    
-    if skillset:
-        query = query.filter(User.skillsets.contains([skillset]))
+    """Get per-period activity series from the pre-bucketed daily rollups"""
+    unknown = set(metrics) - set(ACTIVITY_METRICS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown metrics: {', '.join(sorted(unknown))}"
+        )
     
-    candidates = query.all()
+    end_date = end_date or datetime.utcnow().date()
+    start_date = start_date or end_date - timedelta(days=30)
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must not be after end_date"
+        )
     
-    performance_data = []
-    for candidate in candidates:
-        assignments = candidate.assigned_assignments
-        
-        if len(assignments) < min_assignments:
-            continue
-        
-        completed = [ca for ca in assignments if ca.status == "completed"]
-        total_score = 0
-        certificates_count = 0
-        
-        # Calculate average score from certificates
-        certificates = db.query(Certificate).filter(
-            Certificate.candidate_id == candidate.id
-        ).all()
-        
-        for cert in certificates:
-            total_score += cert.score or 0
-            certificates_count += 1
-        
-        avg_score = total_score / certificates_count if certificates_count > 0 else 0
-        
-        performance_data.append({
-            "candidate_id": candidate.id,
-            "candidate_name": candidate.full_name,
-            "candidate_email": candidate.email,
-            "total_assignments": len(assignments),
-            "completed_assignments": len(completed),
-            "completion_rate": round((len(completed) / len(assignments) * 100) if assignments else 0, 2),
-            "average_score": round(avg_score, 2),
-            "certificates_earned": certificates_count,
-            "skillsets": candidate.skillsets
-        })
+    return {
+        "granularity": granularity,
+        "start_date": start_date,
+        "end_date": end_date,
+        "series": get_activity_series(db, metrics, granularity, start_date, end_date, project_id, skillset),
+        "last_refreshed_at": get_last_refreshed_at(db)
+    }
+
+
+@router.get("/scores/distribution")
+def get_score_distribution(
+    source: str = Query("reviews", regex="^(reviews|certificates)$"),
+    assignment_id: Optional[UUID] = Query(None),
+    project_id: Optional[UUID] = Query(None),
+    skillset: Optional[str] = Query(None),
+    group_by: Optional[str] = Query(None, regex="^(assignment|project|skillset)$"),
+    thresholds: List[int] = Query([PASSING_SCORE]),
+    bins: int = Query(10, ge=1, le=100),
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_read_db)
+):
+    """Get score histograms, percentiles and pass rates under configurable thresholds"""
+    if any(not 0 <= threshold <= 100 for threshold in thresholds):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Thresholds must be between 0 and 100"
+        )
     
-    # Sort by average score
-    performance_data.sort(key=lambda x: x["average_score"], reverse=True)
+    groups = load_scores(db, source, assignment_id, project_id, skillset, group_by)
+    thresholds = sorted(set(thresholds))
     
-    return {
-        "total_candidates": len(performance_data),
-        "top_performers": performance_data[:10],
-        "performance_data": performance_data
+    result = {
+        "source": source,
+        "thresholds": thresholds
     }
+    if group_by is None:
+        result.update(summarize_scores(groups["all"], thresholds, bins))
+    else:
+        result["group_by"] = group_by
+        result["groups"] = {
+            key: summarize_scores(scores, thresholds, bins)
+            for key, scores in groups.items()
+        }
+    return result
+
+
+@router.get("/candidates/performance")
+def get_candidate_performance(
+    skillset: Optional[str] = Query(None),
+    min_assignments: int = Query(1, ge=1),
+    limit: int = Query(PERFORMANCE_DEFAULT_LIMIT, ge=1, le=PERFORMANCE_MAX_LIMIT),
+    cursor: Optional[str] = Query(None),
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_read_db)
+):
+    """Get candidate performance analytics ranked by average certificate score"""
+    return candidate_performance(db, skillset, min_assignments, limit, cursor)
 
 
 @router.get("/projects/summary")
-async def get_projects_summary(
+def get_projects_summary(
+    domain: Optional[str] = Query(None),
+    difficulty_level: Optional[str] = Query(None),
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get projects summary with assignment statistics"""
-    projects = db.query(Project).filter(Project.is_active == True).all()
-    
-    project_summary = []
-    for project in projects:
-        assignments = project.assignments
-        total_assignments = len(assignments)
-        
-        # Count assignments by status
-        assigned_count = 0
-        completed_count = 0
-        in_progress_count = 0
-        
-        for assignment in assignments:
-            candidate_assignments = assignment.candidate_assignments
-            assigned_count += len(candidate_assignments)
-            completed_count += len([ca for ca in candidate_assignments if ca.status == "completed"])
-            in_progress_count += len([ca for ca in candidate_assignments if ca.status == "in_progress"])
-        
-        project_summary.append({
-            "project_id": project.id,
-            "project_name": project.name,
-            "domain": project.domain,
-            "difficulty_level": project.difficulty_level,
-            "total_assignments": total_assignments,
-            "assigned_count": assigned_count,
-            "completed_count": completed_count,
-            "in_progress_count": in_progress_count,
-            "completion_rate": round((completed_count / assigned_count * 100) if assigned_count > 0 else 0, 2)
-        })
+    return projects_summary(db, domain, difficulty_level)
+
+
+@router.get("/export/candidates")
+def export_candidates_report(
+    request: Request,
+    format: str = Query("csv", regex=EXPORT_FORMAT_PATTERN),
+    current_user: User = Depends(require_admin)
+):
+    """Stream the candidates report as CSV or NDJSON, gzip-compressed when accepted"""
+    rows = iter_candidate_export_rows()
+    chunks = encode_csv(rows) if format == "csv" else encode_ndjson(rows)
     
-    return {
-        "total_projects": len(project_summary),
-        "projects": project_summary
+    filename = f"candidates_report_{datetime.utcnow().strftime('%Y%m%d')}.{format}"
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Vary": "Accept-Encoding"
     }
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    else:
+        chunks = (chunk.encode() for chunk in chunks)
+    
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
 
 
-@router.get("/export/candidates")
-async def export_candidates_report(
-    format: str = Query("csv", regex="^(csv|json)$"),
+@router.get("/export/parquet/{table}")
+def export_table_parquet(
+    table: str,
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Export candidates report"""
-    candidates = db.query(User).filter(User.role == "candidate").all()
+    """Export a table as Parquet, optionally only rows created or updated in [since, until)"""
+    if table not in EXPORT_TABLES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown export table. Available: {', '.join(EXPORT_TABLES)}"
+        )
     
-    report_data = []
-    for candidate in candidates:
-        assignments = candidate.assigned_assignments
-        completed = [ca for ca in assignments if ca.status == "completed"]
-        certificates = db.query(Certificate).filter(Certificate.candidate_id == candidate.id).count()
-        
-        report_data.append({
-            "id": str(candidate.id),
-            "name": candidate.full_name,
-            "email": candidate.email,
-            "skillsets": ", ".join(candidate.skillsets),
-            "total_assignments": len(assignments),
-            "completed_assignments": len(completed),
-            "certificates_earned": certificates,
-            "completion_rate": round((len(completed) / len(assignments) * 100) if assignments else 0, 2),
-            "created_at": candidate.created_at.isoformat() if candidate.created_at else None
-        })
+    # Parquet footers are written last, so the file is built on disk in batches
+    # and then sent; the temporary file is removed after the response.
+    handle, path = tempfile.mkstemp(suffix=".parquet")
+    os.close(handle)
+    try:
+        export_table(db, table, path, since=since, until=until)
+    except Exception:
+        os.remove(path)
+        raise
     
-    if format == "csv":
-        # Return CSV format
-        import csv
-        import io
-        
-        output = io.StringIO()
-        writer = csv.DictWriter(output, fieldnames=report_data[0].keys())
-        writer.writeheader()
-        writer.writerows(report_data)
-        
-        return {
-            "format": "csv",
-            "data": output.getvalue(),
-            "filename": f"candidates_report_{datetime.utcnow().strftime('%Y%m%d')}.csv"
-        }
-    else:
-        return {
-            "format": "json",
-            "data": report_data,
-            "total_candidates": len(report_data)
-        } 
\ No newline at end of file
+    return FileResponse(
+        path,
+        media_type="application/vnd.apache.parquet",
+        filename=f"{table}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.parquet",
+        background=BackgroundTask(os.remove, path)
+    )
+
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+def submit_report_job_endpoint(
+    job: ReportJobCreate,
+    current_user: User = Depends(require_admin)
+):
+    """Queue a heavy report on the Celery worker (identical requests share one job)"""
+    return submit_report_job(job.report, job.params)
+
+
+@router.get("/jobs/{job_id}")
+def get_report_job_endpoint(
+    job_id: str,
+    current_user: User = Depends(require_admin)
+):
+    """Get the status of a report job"""
+    return get_report_job(job_id)
+
+
+@router.get("/jobs/{job_id}/result")
+def get_report_job_result(
+    job_id: str,
+    current_user: User = Depends(require_admin)
+):
+    """Get the cached result of a completed report job"""
+    result = get_report_result(job_id)
+    if isinstance(result, dict) and "path" in result:
+        if not os.path.exists(result["path"]):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Report result expired"
+            )
+        return FileResponse(result["path"], media_type=result["media_type"], filename=result["filename"])
+    return result
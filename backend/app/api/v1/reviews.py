@@ -3,18 +3,20 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 
-from ...core.database import get_db
-from ...core.security import get_current_active_user, require_reviewer_or_admin
+from ...core.database import get_db, get_read_db
+from ...core.pagination import paginate_query, cursor_page
+from ...core.security import get_current_principal, require_reviewer_or_admin
 from ...models.user import User
 from ...models.review import Review
 from ...models.submission import Submission
-from ...models.candidate_assignment import CandidateAssignment
+from ...models.loading import REVIEW_WITH_REVIEWER, SUBMISSION_REVIEW_QUEUE, SUBMISSION_WITH_ASSIGNMENT
+from ...services.rollup_service import record_status_change
 
 router = APIRouter()
 
 
 @router.post("/submissions/{submission_id}/review")
-async def create_review(
+def create_review(
     submission_id: UUID,
     score: int,
     feedback: str,
@@ -24,7 +26,7 @@ async def create_review(
 ):
     """Create a review for a submission"""
     # Check if submission exists
-    submission = db.query(Submission).filter(Submission.id == submission_id).first()
+    submission = db.query(Submission).options(*SUBMISSION_WITH_ASSIGNMENT).filter(Submission.id == submission_id).first()
     if not submission:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -67,7 +69,9 @@ async def create_review(
     # Update candidate assignment status if score is passing
     if score >= 70:
         candidate_assignment = submission.candidate_assignment
-        candidate_assignment.status = "completed"
+        old_status = candidate_assignment.status
+        candidate_assignment.set_status("completed")
+        record_status_change(db, candidate_assignment, old_status)
     
     db.commit()
     db.refresh(review)
@@ -80,13 +84,13 @@ async def create_review(
 
 
 @router.get("/submissions/{submission_id}/reviews")
-async def get_submission_reviews(
+def get_submission_reviews(
     submission_id: UUID,
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Get all reviews for a submission"""
-    submission = db.query(Submission).filter(Submission.id == submission_id).first()
+    submission = db.query(Submission).options(*SUBMISSION_WITH_ASSIGNMENT).filter(Submission.id == submission_id).first()
     if not submission:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -102,7 +106,7 @@ async def get_submission_reviews(
                 detail="Can only view reviews for own submissions"
             )
     
-    reviews = db.query(Review).filter(Review.submission_id == submission_id).all()
+    reviews = db.query(Review).options(*REVIEW_WITH_REVIEWER).filter(Review.submission_id == submission_id).all()
     
     result = []
     for review in reviews:
@@ -120,43 +124,46 @@ async def get_submission_reviews(
 
 
 @router.get("/pending")
-async def get_pending_reviews(
+def get_pending_reviews(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Keyset cursor; pass an empty value for the first page"),
     current_user: User = Depends(require_reviewer_or_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get pending reviews for the current reviewer"""
-    # Get submissions that need review
-    pending_submissions = db.query(Submission).filter(
-        Submission.status == "submitted"
-    ).join(CandidateAssignment).join(User).all()
+    # Submissions that need review and that the current user has not reviewed yet
+    already_reviewed = db.query(Review.id).filter(
+        Review.submission_id == Submission.id,
+        Review.reviewer_id == current_user.id
+    ).exists()
+    query = db.query(Submission).options(*SUBMISSION_REVIEW_QUEUE).filter(
+        Submission.status == "submitted",
+        ~already_reviewed
+    )
+    pending_submissions = paginate_query(query, Submission.submitted_at, Submission.id, skip, limit, cursor).all()
+    pending_submissions, next_cursor = cursor_page(pending_submissions, limit, lambda s: (s.submitted_at, s.id))
     
     result = []
     for submission in pending_submissions:
-        # Check if current user already reviewed this submission
-        existing_review = db.query(Review).filter(
-            Review.submission_id == submission.id,
-            Review.reviewer_id == current_user.id
-        ).first()
-        
-        if not existing_review:
-            result.append({
-                "submission_id": submission.id,
-                "candidate_name": submission.candidate_assignment.candidate.full_name,
-                "candidate_email": submission.candidate_assignment.candidate.email,
-                "assignment_title": submission.candidate_assignment.assignment.title,
-                "project_name": submission.candidate_assignment.assignment.project.name,
-                "submission_type": submission.submission_type,
-                "submitted_at": submission.submitted_at,
-                "notes": submission.notes
-            })
-    
-    return result[skip:skip + limit]
+        result.append({
+            "submission_id": submission.id,
+            "candidate_name": submission.candidate_assignment.candidate.full_name,
+            "candidate_email": submission.candidate_assignment.candidate.email,
+            "assignment_title": submission.candidate_assignment.assignment.title,
+            "project_name": submission.candidate_assignment.assignment.project.name,
+            "submission_type": submission.submission_type,
+            "submitted_at": submission.submitted_at,
+            "notes": submission.notes
+        })
+    
+    if cursor is not None:
+        return {"items": result, "next_cursor": next_cursor}
+    return result
 
 
 @router.put("/{review_id}")
-async def update_review(
+def update_review(
     review_id: UUID,
     score: Optional[int] = None,
     feedback: Optional[str] = None,
@@ -201,9 +208,9 @@ async def update_review(
 
 
 @router.get("/stats")
-async def get_review_stats(
+def get_review_stats(
     current_user: User = Depends(require_reviewer_or_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get review statistics for the current user"""
     total_reviews = db.query(Review).filter(Review.reviewer_id == current_user.id).count()
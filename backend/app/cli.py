@@ -0,0 +1,111 @@
+"""
+Maintenance commands for the admin panel backend.
+
+Usage: python -m app.cli <command> [options]
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+
+from .core.database import SessionLocal
+# Import every model so string relationships resolve outside the API process
+from .models import activity, archive, assignment, candidate_assignment, certificate, project, review, rollup, submission, user  # noqa: F401
+
+
+def reconcile_rollups_command(args) -> int:
+    """Rebuild rollup counters from the source tables and report drift"""
+    from .services.rollup_service import reconcile_rollups
+
+    db = SessionLocal()
+    try:
+        drift = reconcile_rollups(db, dry_run=args.dry_run)
+    finally:
+        db.close()
+
+    for entry in drift:
+        print(json.dumps(entry))
+    action = "found" if args.dry_run else "corrected"
+    print(f"{len(drift)} drifted counter(s) {action}", file=sys.stderr)
+    return 1 if drift and args.dry_run else 0
+
+
+def refresh_activity_buckets_command(args) -> int:
+    """Rebuild daily activity buckets (only changed days unless --full)"""
+    from .services.timeseries_service import refresh_activity_buckets
+
+    db = SessionLocal()
+    try:
+        since = refresh_activity_buckets(db, full=args.full)
+    finally:
+        db.close()
+
+    print(f"Rebuilt activity buckets from {since.isoformat() if since else 'the beginning'}", file=sys.stderr)
+    return 0
+
+
+def export_parquet_command(args) -> int:
+    """Export tables to Parquet files, optionally bounded by change time"""
+    from .services.export_service import export_tables
+
+    db = SessionLocal()
+    try:
+        manifest = export_tables(db, args.tables, args.output_dir, since=args.since, until=args.until)
+    finally:
+        db.close()
+
+    for entry in manifest:
+        print(json.dumps(entry))
+    return 0
+
+
+def archive_finished_command(args) -> int:
+    """Move finished candidate assignments with their submissions and reviews to the archive tables"""
+    from .services.archive_service import archive_finished_assignments
+
+    db = SessionLocal()
+    try:
+        moved = archive_finished_assignments(
+            db, older_than_days=args.older_than_days, batch_size=args.batch_size, dry_run=args.dry_run
+        )
+    finally:
+        db.close()
+
+    print(json.dumps(moved))
+    return 0
+
+
+def main(argv=None) -> int:
+    from .services.export_service import EXPORT_TABLES
+
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    reconcile = subparsers.add_parser("reconcile-rollups", help="Rebuild rollup counters and report drift")
+    reconcile.add_argument("--dry-run", action="store_true", help="Report drift without rewriting counters")
+    reconcile.set_defaults(func=reconcile_rollups_command)
+
+    refresh = subparsers.add_parser("refresh-activity-buckets", help="Rebuild daily activity buckets")
+    refresh.add_argument("--full", action="store_true", help="Rebuild every bucket instead of only changed days")
+    refresh.set_defaults(func=refresh_activity_buckets_command)
+
+    export = subparsers.add_parser("export-parquet", help="Export tables to Parquet files")
+    export.add_argument("--tables", nargs="+", choices=list(EXPORT_TABLES), default=list(EXPORT_TABLES))
+    export.add_argument("--output-dir", default="exports")
+    export.add_argument("--since", type=datetime.fromisoformat, help="Only rows created or updated at or after this time")
+    export.add_argument("--until", type=datetime.fromisoformat, help="Only rows created or updated before this time")
+    export.set_defaults(func=export_parquet_command)
+
+    archive = subparsers.add_parser("archive-finished", help="Move finished candidate assignments to the archive tables")
+    archive.add_argument("--older-than-days", type=int, help="Override ARCHIVE_AFTER_DAYS")
+    archive.add_argument("--batch-size", type=int, help="Override ARCHIVE_BATCH_SIZE")
+    archive.add_argument("--dry-run", action="store_true", help="Only count the candidate assignments that would move")
+    archive.set_defaults(func=archive_finished_command)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import redis
+
+from .config import REDIS_CONFIG
+
+# Back off from Redis for this long after a connection error
+REDIS_RETRY_SECONDS = 30
+# Maximum time a refresh may hold the shared lock
+LOCK_TIMEOUT_SECONDS = 30
+# Maximum time a caller waits for another worker's refresh
+LOCK_WAIT_SECONDS = 10
+
+_redis_client: Optional[redis.Redis] = None
+_redis_down_until = 0.0
+_client_lock = threading.Lock()
+
+# Striped locks so concurrent refreshes of one key in this process share a computation
+_key_locks = [threading.Lock() for _ in range(64)]
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """Get the shared Redis client, or None while Redis is unavailable"""
+    global _redis_client
+    if time.monotonic() < _redis_down_until:
+        return None
+    with _client_lock:
+        if _redis_client is None:
+            _redis_client = redis.Redis.from_url(
+                REDIS_CONFIG["url"],
+                decode_responses=REDIS_CONFIG["decode_responses"],
+                socket_timeout=1,
+                socket_connect_timeout=1,
+            )
+    return _redis_client
+
+
+def mark_redis_down():
+    """Stop using Redis for a while after a connection error"""
+    global _redis_down_until
+    _redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+
+class LocalCache:
+    """Thread-safe in-process TTL cache, used when Redis is unavailable"""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: Any, ttl: int):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+local_cache = LocalCache()
+
+
+def cache_get(key: str) -> Optional[Any]:
+    """Get a cached value from Redis, falling back to the local cache"""
+    client = get_redis()
+    if client is not None:
+        try:
+            raw = client.get(key)
+        except redis.RedisError:
+            mark_redis_down()
+        else:
+            return json.loads(raw) if raw is not None else None
+    return local_cache.get(key)
+
+
+def cache_set(key: str, value: Any, ttl: int):
+    """Store a JSON-serializable value for ttl seconds"""
+    client = get_redis()
+    if client is not None:
+        try:
+            client.set(key, json.dumps(value, default=str), ex=ttl)
+            return
+        except redis.RedisError:
+            mark_redis_down()
+    local_cache.set(key, value, ttl)
+
+
+def cache_delete(key: str):
+    """Remove a cached value from Redis and the local cache"""
+    local_cache.delete(key)
+    client = get_redis()
+    if client is not None:
+        try:
+            client.delete(key)
+        except redis.RedisError:
+            mark_redis_down()
+
+
+def get_or_compute(key: str, ttl: int, compute: Callable[[], Any]) -> Any:
+    """Return the cached snapshot for key, computing it at most once at a time.
+
+    Callers in this process serialize on a striped lock; callers in other
+    processes serialize on a Redis lock and pick up the stored snapshot once
+    the current holder has written it.
+    """
+    value = cache_get(key)
+    if value is not None:
+        return value
+
+    with _key_locks[hash(key) % len(_key_locks)]:
+        value = cache_get(key)
+        if value is not None:
+            return value
+
+        lock = None
+        client = get_redis()
+        if client is not None:
+            try:
+                lock = client.lock(
+                    f"{key}:lock",
+                    timeout=LOCK_TIMEOUT_SECONDS,
+                    blocking_timeout=LOCK_WAIT_SECONDS,
+                )
+                if not lock.acquire():
+                    lock = None
+            except redis.RedisError:
+                mark_redis_down()
+                lock = None
+            value = cache_get(key)
+            if value is not None:
+                _release(lock)
+                return value
+
+        try:
+            value = compute()
+            cache_set(key, value, ttl)
+        finally:
+            _release(lock)
+        return value
+
+
+def _release(lock):
+    if lock is None:
+        return
+    try:
+        lock.release()
+    except redis.RedisError:
+        pass
@@ -0,0 +1,22 @@
+from celery import Celery
+
+from .config import CELERY_CONFIG, settings
+
+celery_app = Celery("logbiz_admin", include=["app.tasks"])
+celery_app.conf.update(CELERY_CONFIG)
+
+# Periodic jobs run by celery_beat
+celery_app.conf.beat_schedule = {
+    "refresh-activity-buckets": {
+        "task": "app.tasks.refresh_activity_buckets",
+        "schedule": settings.ACTIVITY_BUCKETS_REFRESH_SECONDS,
+    },
+    "cleanup-report-exports": {
+        "task": "app.tasks.cleanup_report_exports",
+        "schedule": settings.REPORT_EXPORT_CLEANUP_SECONDS,
+    },
+    "archive-finished-assignments": {
+        "task": "app.tasks.archive_finished_assignments",
+        "schedule": settings.ARCHIVE_INTERVAL_SECONDS,
+    },
+}
@@ -1,22 +1,173 @@
-from sqlalchemy import create_engine
+import itertools
+import os
+import threading
+import time
+from fastapi import Request
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-from .config import DATABASE_CONFIG
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
+from .config import DATABASE_CONFIG, settings
+from .pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_pool
+
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": DATABASE_CONFIG["pool_size"],
+        "max_overflow": DATABASE_CONFIG["max_overflow"],
+        "pool_timeout": DATABASE_CONFIG["pool_timeout"],
+        "pool_recycle": DATABASE_CONFIG["pool_recycle"],
+        "pool_pre_ping": DATABASE_CONFIG["pool_pre_ping"],
+    }
+
+
+# Applied to every SQLite connection
+SQLITE_PRAGMAS = {
+    "foreign_keys": "ON",
+    "busy_timeout": "5000",  # Wait up to 5s for a competing writer instead of failing
+    "synchronous": "NORMAL",  # Safe with WAL and far fewer fsyncs than FULL
+    "cache_size": "-65536",  # 64 MB page cache
+    "temp_store": "MEMORY",
+}
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    return "mode=memory" in url
+
+
+def _configure_sqlite(new_engine, url: str):
+    """Set the pragmas, and WAL for file databases, on each new connection"""
+    pragmas = dict(SQLITE_PRAGMAS)
+    if not _is_sqlite_memory(url):
+        # Readers no longer block the writer (or each other)
+        pragmas["journal_mode"] = "WAL"
+    
+    @event.listens_for(new_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def _engine_options(url: str, queue_pool) -> dict:
+    if _is_sqlite(url) and _is_sqlite_memory(url):
+        # One connection keeps the in-memory database alive
+        return {"poolclass": StaticPool}
+    return {"poolclass": queue_pool, **_pool_options()}
+
+
+def _create_engine(url: str, name: str):
+    options = _engine_options(url, InstrumentedQueuePool)
+    if _is_sqlite(url):
+        # Sessions are used from FastAPI's threadpool
+        options["connect_args"] = {"check_same_thread": False}
+    new_engine = create_engine(url, echo=DATABASE_CONFIG["echo"], **options)
+    if _is_sqlite(url):
+        _configure_sqlite(new_engine, url)
+    if isinstance(new_engine.pool, QueuePool):
+        instrument_pool(name, new_engine.pool)
+    return new_engine
+
 
 # Create database engine
-engine = create_engine(
-    DATABASE_CONFIG["url"],
-    echo=DATABASE_CONFIG["echo"],
-    pool_size=DATABASE_CONFIG["pool_size"],
-    max_overflow=DATABASE_CONFIG["max_overflow"],
-    pool_pre_ping=DATABASE_CONFIG["pool_pre_ping"],
-    poolclass=StaticPool if DATABASE_CONFIG["url"].startswith("sqlite") else None,
-)
+engine = _create_engine(DATABASE_CONFIG["url"], "primary")
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Seconds a replica trails the primary; 0 when it has replayed everything it received
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+# Request header asking get_read_db for the primary, to read back a write just made
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+
+
+class ReplicaSet:
+    """Read replicas handed out round-robin, skipping unhealthy ones.
+    
+    A replica is checked (reachable and within REPLICA_MAX_LAG_SECONDS of the
+    primary) at most once per REPLICA_HEALTH_CHECK_SECONDS; one that fails a
+    connection in between is marked down until its next check.
+    """
+    
+    def __init__(self, urls, check_interval: float, max_lag: float):
+        self.engines = [_create_engine(url, f"replica-{index}") for index, url in enumerate(urls)]
+        self.check_interval = check_interval
+        self.max_lag = max_lag
+        self._healthy = [True] * len(self.engines)
+        self._checked_at = [float("-inf")] * len(self.engines)
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+    
+    def _check(self, index: int) -> bool:
+        try:
+            with self.engines[index].connect() as connection:
+                lag = connection.execute(REPLICA_LAG_SQL).scalar()
+        except SQLAlchemyError:
+            return False
+        return float(lag or 0) <= self.max_lag
+    
+    def is_healthy(self, index: int) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            due = now - self._checked_at[index] >= self.check_interval
+            if due:
+                # Other requests keep using the previous result while this one checks
+                self._checked_at[index] = now
+        if due:
+            self._healthy[index] = self._check(index)
+        return self._healthy[index]
+    
+    def mark_down(self, index: int):
+        self._healthy[index] = False
+        self._checked_at[index] = time.monotonic()
+    
+    def healthy(self):
+        """Yield (index, engine) of healthy replicas, starting at the next in rotation"""
+        if not self.engines:
+            return
+        start = next(self._counter)
+        for offset in range(len(self.engines)):
+            index = (start + offset) % len(self.engines)
+            if self.is_healthy(index):
+                yield index, self.engines[index]
+
+
+replicas = ReplicaSet(
+    DATABASE_CONFIG["replica_urls"],
+    check_interval=settings.REPLICA_HEALTH_CHECK_SECONDS,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+)
+
+# Create asyncio engine and session factory for routers that await their queries
+async_engine = create_async_engine(
+    DATABASE_CONFIG["async_url"],
+    echo=DATABASE_CONFIG["echo"],
+    **_engine_options(DATABASE_CONFIG["async_url"], InstrumentedAsyncQueuePool),
+)
+if _is_sqlite(DATABASE_CONFIG["async_url"]):
+    _configure_sqlite(async_engine.sync_engine, DATABASE_CONFIG["async_url"])
+if isinstance(async_engine.sync_engine.pool, QueuePool):
+    instrument_pool("async", async_engine.sync_engine.pool)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), "..", "..", "alembic.ini")
+# Revision matching the schema the old create_all() bootstrap produced
+BASELINE_REVISION = "0001"
+
 # Create base class for models
 Base = declarative_base()
 
@@ -30,6 +181,70 @@ def get_db():
         db.close()
 
 
+def dialect_insert(db: Session, table):
+    """INSERT for the session's backend; Postgres and SQLite share the
+    on_conflict_do_nothing/on_conflict_do_update API"""
+    insert = sqlite.insert if db.bind.dialect.name == "sqlite" else postgresql.insert
+    return insert(table)
+
+
+def _read_session(read_your_writes: bool) -> Session:
+    if not read_your_writes:
+        for index, replica in replicas.healthy():
+            db = SessionLocal(bind=replica)
+            try:
+                # Connect now so an unreachable replica falls through to the next one
+                db.connection()
+                return db
+            except SQLAlchemyError:
+                db.close()
+                replicas.mark_down(index)
+    return SessionLocal()
+
+
+def get_read_db(request: Request):
+    """Dependency to get a database session for read-only endpoints.
+    
+    Sessions are bound to a healthy read replica, or to the primary when no
+    replica is configured or reachable. Replicas lag slightly behind, so a
+    client that has just written can send ``X-Read-Your-Writes: 1`` to be
+    served from the primary and see its own changes.
+    """
+    read_your_writes = request.headers.get(READ_YOUR_WRITES_HEADER, "").lower() in ("1", "true", "yes")
+    db = _read_session(read_your_writes)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """Dependency to get an asyncio database session.
+    
+    Routers that still use get_db declare plain ``def`` handlers so FastAPI
+    runs them in its threadpool instead of blocking the event loop.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
-    """Initialize database with tables"""
-    Base.metadata.create_all(bind=engine) 
\ No newline at end of file
+    """Bring the database schema up to date by running the Alembic migrations.
+    
+    Databases created by the old create_all() bootstrap have the tables but no
+    alembic_version table; they are stamped at the baseline revision first.
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    tables = inspect(engine).get_table_names()
+    # Migrate through the application engine (an in-memory SQLite database
+    # only exists on its connection)
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        if "users" in tables and "alembic_version" not in tables:
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
+        connection.commit() 
\ No newline at end of file
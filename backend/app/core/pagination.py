@@ -0,0 +1,62 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+
+
+def invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode the sort key of the last returned row as an opaque cursor"""
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Decode a cursor produced by encode_cursor into its sort key values"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, binascii.Error):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise invalid_cursor()
+    return values
+
+
+def paginate_query(query, created_column, id_column, skip: int, limit: int, cursor: Optional[str]):
+    """Order a query (ORM query or select) by (created_column, id_column) and select one page.
+    
+    With a cursor (an empty string asks for the first page) the page starts
+    right after the row the cursor points at, and one extra row is fetched so
+    cursor_page can tell whether another page follows. Without one, the
+    skip/limit offset paging of older clients applies.
+    """
+    query = query.order_by(created_column, id_column)
+    if cursor is None:
+        return query.offset(skip).limit(limit)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor, 2)
+        try:
+            position = (datetime.fromisoformat(created_at), UUID(row_id))
+        except (TypeError, ValueError):
+            raise invalid_cursor()
+        query = query.where(tuple_(created_column, id_column) > tuple_(*position))
+    return query.limit(limit + 1)
+
+
+def cursor_page(rows: Sequence, limit: int, key: Callable[[Any], Tuple[datetime, UUID]]) -> Tuple[Sequence, Optional[str]]:
+    """Trim the extra row fetched by paginate_query and build the cursor of the next page"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(list(key(rows[-1])))
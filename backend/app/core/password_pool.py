@@ -0,0 +1,58 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PasswordPoolSaturated(Exception):
+    """Every worker is busy and the wait queue is full"""
+
+
+class PasswordPool:
+    """Bounded thread pool for bcrypt hashing and verification.
+
+    bcrypt releases the GIL while it works, so threads give real parallelism
+    and keep the event loop free. At most ``workers + max_queue`` calls are
+    admitted at once; further calls fail immediately with
+    PasswordPoolSaturated instead of queueing without limit. A slot is held
+    until the hash finishes, even when the awaiting request was cancelled.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password")
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._rejected = 0
+        self._completed = 0
+
+    def _release(self, _future):
+        with self._lock:
+            self._admitted -= 1
+            self._completed += 1
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self._admitted >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise PasswordPoolSaturated()
+            self._admitted += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            with self._lock:
+                self._admitted -= 1
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._admitted,
+                "queued": max(0, self._admitted - self.workers),
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
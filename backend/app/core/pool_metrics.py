@@ -0,0 +1,135 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (milliseconds) of the checkout wait-time histogram buckets
+WAIT_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000]
+
+
+class PoolMetrics:
+    """Counters and a checkout wait-time histogram for one connection pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.connects = 0  # new DBAPI connections opened
+        self.closes = 0  # DBAPI connections closed (recycle, overflow shrink, errors)
+        self.invalidations = 0
+        self.max_overflow_seen = 0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.wait_total_ms = 0.0
+
+    def observe_wait(self, waited_ms: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_buckets[bisect_left(WAIT_BUCKETS_MS, waited_ms)] += 1
+            self.wait_total_ms += waited_ms
+            if timed_out:
+                self.timeouts += 1
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+            if counter == "checkouts" and self.pool is not None:
+                self.max_overflow_seen = max(self.max_overflow_seen, self.pool.overflow())
+
+    def snapshot(self) -> Dict:
+        pool = self.pool
+        with self._lock:
+            waits = sum(self.wait_buckets)
+            histogram = [
+                {"le_ms": bound, "count": count}
+                for bound, count in zip(WAIT_BUCKETS_MS + ["+Inf"], self.wait_buckets)
+            ]
+            return {
+                "pool": self.name,
+                "size": pool.size() if pool is not None else None,
+                "checked_out": pool.checkedout() if pool is not None else None,
+                "idle": pool.checkedin() if pool is not None else None,
+                "overflow": max(pool.overflow(), 0) if pool is not None else None,
+                "max_overflow_seen": max(self.max_overflow_seen, 0),
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "closes": self.closes,
+                "invalidations": self.invalidations,
+                "wait_ms": {
+                    "count": waits,
+                    "mean": round(self.wait_total_ms / waits, 3) if waits else None,
+                    "histogram": histogram,
+                },
+            }
+
+
+class _WaitTimingMixin:
+    """Times how long a checkout waits for a free connection.
+
+    Pool events fire once a connection is handed out, so the wait itself is
+    measured around the pool's internal get.
+    """
+
+    metrics: PoolMetrics = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self._record_wait(started, timed_out=True)
+            raise
+        self._record_wait(started)
+        return connection
+
+    def _record_wait(self, started: float, timed_out: bool = False):
+        if self.metrics is not None:
+            self.metrics.observe_wait((time.perf_counter() - started) * 1000, timed_out)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# Metrics of every instrumented pool, by name
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def instrument_pool(name: str, pool) -> PoolMetrics:
+    """Collect checkout, overflow and churn metrics for a pool through pool events"""
+    metrics = PoolMetrics(name)
+    metrics.pool = pool
+    if isinstance(pool, _WaitTimingMixin):
+        pool.metrics = metrics
+
+    event.listen(pool, "connect", lambda *args: metrics.increment("connects"))
+    event.listen(pool, "close", lambda *args: metrics.increment("closes"))
+    event.listen(pool, "close_detached", lambda *args: metrics.increment("closes"))
+    event.listen(pool, "invalidate", lambda *args: metrics.increment("invalidations"))
+    event.listen(pool, "checkout", lambda *args: metrics.increment("checkouts"))
+    event.listen(pool, "checkin", lambda *args: metrics.increment("checkins"))
+
+    pool_metrics[name] = metrics
+    return metrics
+
+
+def pool_metrics_snapshot() -> Dict:
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
@@ -0,0 +1,207 @@
+"""
+Cache of authenticated principals for get_current_user, and the per-user
+auth version stamps checked by claims-only authorization.
+
+Entries hold the user columns request handlers read, keyed by user id, for
+PRINCIPAL_CACHE_TTL_SECONDS. Lookups try this process first, then Redis when
+PRINCIPAL_CACHE_REDIS is enabled. Changing a user through the ORM drops the
+entry from this process and Redis once the transaction commits; other
+processes may keep serving their local copy until it expires, so a
+deactivation or role change takes effect within the TTL at worst. Bulk
+UPDATE statements bypass the ORM events and rely on the TTL alone.
+
+Changing a user's role or active flag also bumps users.auth_version. The new
+version is published (locally and to Redis when reachable) as the floor below
+which that user's access tokens are rejected without a database lookup. Other
+processes cache the shared floor for AUTH_VERSION_FLOOR_CACHE_SECONDS, which
+bounds how long they keep accepting claims from before the change.
+"""
+
+import json
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+import redis
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+from starlette.concurrency import run_in_threadpool
+
+from .cache import get_redis, local_cache, mark_redis_down
+from .config import settings
+from ..models.user import User
+
+# Columns cached per principal; a change to any of them invalidates the entry
+PRINCIPAL_FIELDS = (
+    "id", "email", "full_name", "role", "skillsets", "is_active", "auth_version", "created_at", "updated_at",
+)
+# Columns whose change revokes the user's issued access tokens
+AUTH_VERSION_FIELDS = ("role", "is_active")
+_DATETIME_FIELDS = ("created_at", "updated_at")
+# Session.info key collecting principals to invalidate on commit
+_STALE_KEY = "stale_principals"
+_VERSION_KEY = "bumped_auth_versions"
+
+
+def _key(user_id) -> str:
+    return f"principal:{user_id}"
+
+
+def _dump(user: User) -> dict:
+    data = {field: getattr(user, field) for field in PRINCIPAL_FIELDS}
+    data["id"] = str(user.id)
+    for field in _DATETIME_FIELDS:
+        if data[field] is not None:
+            data[field] = data[field].isoformat()
+    return data
+
+
+def _load(data: dict) -> User:
+    """Detached User built from cached columns; relationships are not loaded"""
+    values = dict(data)
+    values["id"] = UUID(values["id"])
+    for field in _DATETIME_FIELDS:
+        if values[field] is not None:
+            values[field] = datetime.fromisoformat(values[field])
+    return User(**values)
+
+
+def _shared_principal(user_id: UUID) -> Optional[dict]:
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        raw = client.get(_key(user_id))
+    except redis.RedisError:
+        mark_redis_down()
+        return None
+    return json.loads(raw) if raw is not None else None
+
+
+async def get_cached_principal(user_id: UUID) -> Optional[User]:
+    data = local_cache.get(_key(user_id))
+    if data is None and settings.PRINCIPAL_CACHE_REDIS:
+        # The Redis client is synchronous; keep its round trip off the event loop
+        data = await run_in_threadpool(_shared_principal, user_id)
+        if data is not None:
+            local_cache.set(_key(user_id), data, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+    return _load(data) if data is not None else None
+
+
+def _share_principal(user_id: UUID, data: dict):
+    client = get_redis()
+    if client is not None:
+        try:
+            client.set(_key(user_id), json.dumps(data), ex=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+        except redis.RedisError:
+            mark_redis_down()
+
+
+async def cache_principal(user: User):
+    if settings.PRINCIPAL_CACHE_TTL_SECONDS <= 0:
+        return
+    data = _dump(user)
+    local_cache.set(_key(user.id), data, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+    if settings.PRINCIPAL_CACHE_REDIS:
+        await run_in_threadpool(_share_principal, user.id, data)
+
+
+def invalidate_principal(user_id: UUID):
+    local_cache.delete(_key(user_id))
+    if settings.PRINCIPAL_CACHE_REDIS:
+        client = get_redis()
+        if client is not None:
+            try:
+                client.delete(_key(user_id))
+            except redis.RedisError:
+                mark_redis_down()
+
+
+def _version_key(user_id) -> str:
+    return f"authver:{user_id}"
+
+
+def publish_auth_version(user_id: UUID, version: int):
+    """Reject this user's tokens stamped below version from now on.
+
+    The floor only needs to outlive tokens still accepted from claims alone;
+    older tokens go through the database, which holds the current version.
+    """
+    ttl = settings.CLAIMS_ONLY_MAX_TOKEN_AGE_SECONDS
+    local_cache.set(_version_key(user_id), version, ttl)
+    client = get_redis()
+    if client is not None:
+        try:
+            client.set(_version_key(user_id), version, ex=ttl)
+        except redis.RedisError:
+            mark_redis_down()
+
+
+def _floor_cache_key(user_id) -> str:
+    return f"authver-shared:{user_id}"
+
+
+def _shared_auth_version(user_id: UUID) -> int:
+    client = get_redis()
+    if client is None:
+        return 0
+    try:
+        shared = client.get(_version_key(user_id))
+    except redis.RedisError:
+        mark_redis_down()
+        return 0
+    return int(shared) if shared is not None else 0
+
+
+async def auth_version_floor(user_id: UUID) -> int:
+    """Lowest auth version still accepted for the user (0 when none was published).
+
+    Floors published by other processes are read from Redis at most once per
+    AUTH_VERSION_FLOOR_CACHE_SECONDS per user, off the event loop.
+    """
+    shared = local_cache.get(_floor_cache_key(user_id))
+    if shared is None:
+        shared = await run_in_threadpool(_shared_auth_version, user_id)
+        local_cache.set(_floor_cache_key(user_id), shared, settings.AUTH_VERSION_FLOOR_CACHE_SECONDS)
+    return max(local_cache.get(_version_key(user_id)) or 0, shared)
+
+
+def _mark_stale(target: User):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_STALE_KEY, set()).add(target.id)
+
+
+@event.listens_for(User, "before_update")
+def _bump_auth_version(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in AUTH_VERSION_FIELDS):
+        target.auth_version = (target.auth_version or 0) + 1
+        object_session(target).info.setdefault(_VERSION_KEY, {})[target.id] = target.auth_version
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in PRINCIPAL_FIELDS):
+        _mark_stale(target)
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    _mark_stale(target)
+
+
+# Invalidate after commit so a concurrent request cannot re-cache the old row
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    for user_id in session.info.pop(_STALE_KEY, ()):
+        invalidate_principal(user_id)
+    for user_id, version in session.info.pop(_VERSION_KEY, {}).items():
+        publish_auth_version(user_id, version)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stale(session):
+    session.info.pop(_STALE_KEY, None)
+    session.info.pop(_VERSION_KEY, None)
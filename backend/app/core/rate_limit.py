@@ -0,0 +1,221 @@
+"""
+Token-bucket rate limiting for expensive endpoints.
+
+A bucket holds up to ``count`` tokens and refills continuously at the rate
+given as "<count>/<second|minute|hour|day>" in the settings, so a client can
+burst up to ``count`` requests and is then held to the average rate. Buckets
+live in Redis and are updated by a Lua script, which keeps the check atomic
+across workers and uses the Redis clock. While Redis is unavailable each
+process falls back to its own buckets, so the effective limit is multiplied
+by the number of workers until Redis returns.
+
+RateLimiter instances are FastAPI dependencies. They answer 429 with
+Retry-After once a bucket is empty, and set RateLimit-Limit,
+RateLimit-Remaining and RateLimit-Reset on the responses they let through.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import redis
+from fastapi import HTTPException, Request, Response, status
+from starlette.concurrency import run_in_threadpool
+
+from .cache import get_redis, mark_redis_down
+from .config import settings
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# KEYS[1] bucket; ARGV capacity, refill per second, cost.
+# Returns {allowed, tokens left} with tokens as a string to keep the fraction.
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+# Local buckets kept before full ones are pruned
+_LOCAL_PRUNE_THRESHOLD = 10_000
+
+
+@dataclass(frozen=True)
+class Rate:
+    capacity: int
+    per_second: float
+
+
+@lru_cache(maxsize=None)
+def parse_rate(spec: str) -> Rate:
+    """Parse "<count>/<second|minute|hour|day>", e.g. "20/minute" """
+    count, _, period = spec.partition("/")
+    period = period.strip().lower().rstrip("s")
+    if period not in _PERIODS or not count.strip().isdigit() or int(count) <= 0:
+        raise ValueError(f"Invalid rate limit {spec!r}, expected e.g. '20/minute'")
+    return Rate(capacity=int(count), per_second=int(count) / _PERIODS[period])
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    limit: int
+    remaining: int
+    # Seconds until the bucket is full again
+    reset_after: float
+    # Seconds until the next request would be allowed (0 when allowed)
+    retry_after: float
+
+
+def _decision(rate: Rate, allowed: bool, tokens: float, cost: int) -> Decision:
+    return Decision(
+        allowed=allowed,
+        limit=rate.capacity,
+        remaining=max(0, math.floor(tokens)),
+        reset_after=(rate.capacity - tokens) / rate.per_second,
+        retry_after=0.0 if allowed else (cost - tokens) / rate.per_second,
+    )
+
+
+class TokenBuckets:
+    """Token buckets in Redis, with per-process buckets while Redis is down"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> (tokens, monotonic time of last update, rate)
+        self._local: Dict[str, Tuple[float, float, Rate]] = {}
+        self._script = None
+        self._script_client = None
+
+    def _redis_take(self, client: redis.Redis, key: str, rate: Rate, cost: int) -> Tuple[bool, float]:
+        if self._script_client is not client:
+            self._script = client.register_script(_TOKEN_BUCKET_SCRIPT)
+            self._script_client = client
+        allowed, tokens = self._script(keys=[key], args=[rate.capacity, rate.per_second, cost])
+        return bool(int(allowed)), float(tokens)
+
+    def _local_take(self, key: str, rate: Rate, cost: int) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._local) > _LOCAL_PRUNE_THRESHOLD:
+                self._prune(now)
+            tokens, updated, _ = self._local.get(key, (rate.capacity, now, rate))
+            tokens = min(rate.capacity, tokens + (now - updated) * rate.per_second)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._local[key] = (tokens, now, rate)
+            return allowed, tokens
+
+    def _prune(self, now: float):
+        """Drop buckets that have refilled, which a fresh bucket reproduces"""
+        self._local = {
+            key: (tokens, updated, rate) for key, (tokens, updated, rate) in self._local.items()
+            if tokens + (now - updated) * rate.per_second < rate.capacity
+        }
+
+    def take(self, key: str, rate: Rate, cost: int = 1) -> Decision:
+        """Take cost tokens, falling back to this process's bucket when Redis
+        fails. Blocks on Redis; async callers go through take_async."""
+        client = get_redis()
+        if client is not None:
+            try:
+                return _decision(rate, *self._redis_take(client, key, rate, cost), cost)
+            except redis.RedisError:
+                mark_redis_down()
+        return _decision(rate, *self._local_take(key, rate, cost), cost)
+
+    async def take_async(self, key: str, rate: Rate, cost: int = 1) -> Decision:
+        # The Redis client is synchronous; keep its round trip off the event loop
+        return await run_in_threadpool(self.take, key, rate, cost)
+
+
+buckets = TokenBuckets()
+
+
+def client_ip(request: Request) -> Optional[str]:
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            # Earlier entries are supplied by the client and can be forged
+            return forwarded.split(",")[-1].strip()
+    return request.client.host if request.client else None
+
+
+async def client_ip_key(request: Request) -> Optional[str]:
+    return client_ip(request)
+
+
+async def login_email_key(request: Request) -> Optional[str]:
+    """Email from a JSON login body (FastAPI has already read and cached it)"""
+    try:
+        body = await request.json()
+    except ValueError:
+        return None
+    email = body.get("email") if isinstance(body, dict) else None
+    if not isinstance(email, str) or not email:
+        return None
+    return hashlib.sha256(email.strip().lower().encode()).hexdigest()
+
+
+class RateLimiter:
+    """FastAPI dependency taking one token per request from the caller's bucket.
+
+    ``setting`` names the Settings field holding the rate and doubles as the
+    bucket namespace; ``key`` picks the bucket for a request, or returns None
+    to let it through unmetered. When several limiters guard one route the
+    headers describe the one closest to running out.
+    """
+
+    def __init__(self, setting: str, key: Callable[[Request], Awaitable[Optional[str]]] = client_ip_key):
+        self.setting = setting
+        self.key = key
+        self.namespace = setting.lower()
+
+    async def __call__(self, request: Request, response: Response):
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        key = await self.key(request)
+        if key is None:
+            return
+        rate = parse_rate(getattr(settings, self.setting))
+        decision = await buckets.take_async(f"ratelimit:{self.namespace}:{key}", rate)
+        headers = {
+            "RateLimit-Limit": str(decision.limit),
+            "RateLimit-Remaining": str(decision.remaining),
+            "RateLimit-Reset": str(math.ceil(decision.reset_after)),
+        }
+        if not decision.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(decision.retry_after)))
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, try again later",
+                headers=headers,
+            )
+        current = response.headers.get("RateLimit-Remaining")
+        if current is None or decision.remaining < int(current):
+            response.headers.update(headers)
+
+
+login_ip_limit = RateLimiter("RATE_LIMIT_LOGIN_PER_IP")
+login_email_limit = RateLimiter("RATE_LIMIT_LOGIN_PER_EMAIL", key=login_email_key)
+register_limit = RateLimiter("RATE_LIMIT_REGISTER_PER_IP")
+refresh_limit = RateLimiter("RATE_LIMIT_REFRESH_PER_IP")
+certificate_limit = RateLimiter("RATE_LIMIT_CERTIFICATE_PER_IP")
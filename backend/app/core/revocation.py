@@ -0,0 +1,217 @@
+"""
+Revocation store for access and refresh tokens.
+
+Every token carries a ``jti``, and the tokens of one login share a ``fam``
+(token family) that refresh rotation passes on. Revoking an id writes
+``revoked:<id>`` to Redis until the token would have expired anyway, appends
+the id to the ``token-revocations`` stream and adds it to this process's
+Bloom filter.
+
+Checks consult the Bloom filter first, so a token that was never revoked is
+accepted without leaving the process; only filter hits are confirmed in
+Redis, from a worker thread. A background thread per process publishes this
+process's revocations and pulls new stream entries every
+REVOCATION_SYNC_SECONDS, which bounds how long a revocation made by another
+worker takes to apply, and rebuilds the filter from the stream every
+REVOCATION_REBUILD_SECONDS to shed expired ids. While Redis is unreachable a
+filter hit that cannot be confirmed counts as revoked.
+"""
+
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import redis
+from starlette.concurrency import run_in_threadpool
+
+from .cache import get_redis, local_cache, mark_redis_down
+from .config import settings
+
+logger = logging.getLogger("app.revocation")
+
+REVOCATION_STREAM = "token-revocations"
+
+
+def _revoked_key(token_id: str) -> str:
+    return f"revoked:{token_id}"
+
+
+def _refresh_used_key(token_id: str) -> str:
+    return f"refresh-used:{token_id}"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings: no false negatives, tunable false positives"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        return ((first + index * step) % self.size for index in range(self.hashes))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationStore:
+    """Revoked token and family ids, shared through Redis"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = self._new_filter()
+        # Revocations not yet written to Redis: id -> expiry timestamp
+        self._unpublished: Dict[str, float] = {}
+        self._last_entry_id = "0-0"
+        self._next_rebuild = 0.0
+        self._wake = threading.Event()
+        self._sync_thread: Optional[threading.Thread] = None
+        self._sync_pid: Optional[int] = None
+
+    @staticmethod
+    def _new_filter() -> BloomFilter:
+        return BloomFilter(settings.REVOCATION_BLOOM_CAPACITY, settings.REVOCATION_BLOOM_ERROR_RATE)
+
+    @staticmethod
+    def _max_token_lifetime() -> int:
+        return max(settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60, settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400)
+
+    def _ensure_sync_thread(self):
+        """Start the sync thread on first use (again in a forked child)"""
+        if self._sync_pid == os.getpid():
+            return
+        with self._lock:
+            if self._sync_pid == os.getpid():
+                return
+            self._sync_thread = threading.Thread(target=self._sync_loop, name="token-revocations", daemon=True)
+            self._sync_pid = os.getpid()
+            self._sync_thread.start()
+
+    def _sync_loop(self):
+        while True:
+            client = get_redis()
+            if client is not None:
+                try:
+                    self._sync(client)
+                except Exception:
+                    # Keep the thread alive; the next pass retries
+                    logger.exception("Token revocation sync failed")
+            self._wake.wait(settings.REVOCATION_SYNC_SECONDS)
+            self._wake.clear()
+
+    def _publish(self, client: redis.Redis, token_id: str, expires_at: float):
+        ttl = math.ceil(expires_at - time.time())
+        if ttl <= 0:
+            return
+        # Stream entries older than any token lifetime can no longer matter
+        oldest_kept_ms = int((time.time() - self._max_token_lifetime()) * 1000)
+        pipeline = client.pipeline()
+        pipeline.set(_revoked_key(token_id), 1, ex=ttl)
+        pipeline.xadd(REVOCATION_STREAM, {"id": token_id, "exp": int(expires_at)}, minid=oldest_kept_ms)
+        pipeline.execute()
+
+    def _sync(self, client: redis.Redis):
+        """Publish pending revocations and pull those made by other processes"""
+        with self._lock:
+            unpublished, self._unpublished = self._unpublished, {}
+        try:
+            try:
+                for token_id, expires_at in list(unpublished.items()):
+                    self._publish(client, token_id, expires_at)
+                    del unpublished[token_id]
+            finally:
+                with self._lock:
+                    self._unpublished.update(unpublished)
+
+            now = time.monotonic()
+            rebuild = now >= self._next_rebuild
+            if rebuild:
+                entries = client.xrange(REVOCATION_STREAM)
+            else:
+                response = client.xread({REVOCATION_STREAM: self._last_entry_id})
+                entries = response[0][1] if response else []
+
+            wall_clock = time.time()
+            with self._lock:
+                if rebuild:
+                    self._filter = self._new_filter()
+                    self._next_rebuild = now + settings.REVOCATION_REBUILD_SECONDS
+                    for token_id, expires_at in self._unpublished.items():
+                        if expires_at > wall_clock:
+                            self._filter.add(token_id)
+                for entry_id, fields in entries:
+                    if float(fields["exp"]) > wall_clock:
+                        self._filter.add(fields["id"])
+                    self._last_entry_id = entry_id
+        except redis.RedisError:
+            mark_redis_down()
+
+    def revoke(self, token_id: str, expires_at: float):
+        """Reject token_id (a jti or family id) until expires_at, a Unix timestamp.
+
+        Applies in this process at once; the sync thread publishes it to
+        Redis right away, or once Redis is reachable again.
+        """
+        ttl = math.ceil(expires_at - time.time())
+        if ttl <= 0:
+            return
+        self._ensure_sync_thread()
+        # Exact record for this process, also used while Redis is down
+        local_cache.set(_revoked_key(token_id), True, ttl)
+        with self._lock:
+            self._filter.add(token_id)
+            self._unpublished[token_id] = expires_at
+        self._wake.set()
+
+    def _confirm(self, token_ids: List[str]) -> bool:
+        client = get_redis()
+        if client is not None:
+            try:
+                return client.exists(*(_revoked_key(token_id) for token_id in token_ids)) > 0
+            except redis.RedisError:
+                mark_redis_down()
+        return True
+
+    async def is_revoked(self, *token_ids: Optional[str]) -> bool:
+        """True when any of the given ids (None entries are skipped) was revoked"""
+        self._ensure_sync_thread()
+        with self._lock:
+            hits = [token_id for token_id in token_ids if token_id and token_id in self._filter]
+        if not hits:
+            return False
+        if any(local_cache.get(_revoked_key(token_id)) for token_id in hits):
+            return True
+        return await run_in_threadpool(self._confirm, hits)
+
+    def _claim_refresh_token(self, token_id: str, expires_at: float) -> bool:
+        ttl = max(1, math.ceil(expires_at - time.time()))
+        client = get_redis()
+        if client is not None:
+            try:
+                return bool(client.set(_refresh_used_key(token_id), 1, nx=True, ex=ttl))
+            except redis.RedisError:
+                mark_redis_down()
+        with self._lock:
+            if local_cache.get(_refresh_used_key(token_id)):
+                return False
+            local_cache.set(_refresh_used_key(token_id), True, ttl)
+            return True
+
+    async def claim_refresh_token(self, token_id: str, expires_at: float) -> bool:
+        """Mark a refresh token as used; False when it had been used before"""
+        return await run_in_threadpool(self._claim_refresh_token, token_id, expires_at)
+
+
+revocation_store = RevocationStore()
@@ -1,13 +1,20 @@
+import time
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
+from uuid import UUID
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from .config import settings
 from ..models.user import User
-from ..core.database import get_db
+from ..core.database import get_async_db
+from .password_pool import PasswordPool, PasswordPoolSaturated
+from .principal_cache import auth_version_floor, cache_principal, get_cached_principal
+from .revocation import revocation_store
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -26,6 +33,31 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# bcrypt takes tens of milliseconds of CPU per call; async handlers run it here
+password_pool = PasswordPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
+
+
+async def _run_in_password_pool(fn, *args):
+    try:
+        return await password_pool.run(fn, *args)
+    except PasswordPoolSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many password checks in progress, try again shortly",
+            headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+        )
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password pool (503 when it is saturated)"""
+    return await _run_in_password_pool(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the password pool (503 when it is saturated)"""
+    return await _run_in_password_pool(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -34,16 +66,29 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
+def new_token_family() -> str:
+    """Id shared by the tokens of one login and the refreshes that follow it"""
+    return uuid.uuid4().hex
+
+
+def access_token_claims(user: User, family: str) -> dict:
+    """Claims embedded in a user's access tokens"""
+    return {
+        "sub": str(user.id), "email": user.email, "role": user.role,
+        "ver": user.auth_version or 0, "fam": family,
+    }
+
+
 def create_refresh_token(data: dict) -> str:
     """Create JWT refresh token"""
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -57,34 +102,64 @@ def verify_token(token: str) -> Optional[dict]:
         return None
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user"""
-    credentials_exception = HTTPException(
+def revoke_token(payload: dict):
+    """Revoke a decoded token together with every token of its login"""
+    if payload.get("jti"):
+        revocation_store.revoke(payload["jti"], payload["exp"])
+    if payload.get("fam"):
+        # The family's newest refresh token may live this long
+        revocation_store.revoke(payload["fam"], time.time() + settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400)
+
+
+async def is_token_revoked(payload: dict) -> bool:
+    return await revocation_store.is_revoked(payload.get("jti"), payload.get("fam"))
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
-    token = credentials.credentials
-    payload = verify_token(token)
-    
-    if payload is None:
-        raise credentials_exception
-    
-    user_id: str = payload.get("sub")
-    if user_id is None:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.id == user_id).first()
+
+
+async def _token_payload(credentials: HTTPAuthorizationCredentials) -> Tuple[dict, UUID]:
+    payload = verify_token(credentials.credentials)
+    # Refresh tokens are only good for /auth/refresh
+    if payload is None or payload.get("type") == "refresh" or await is_token_revoked(payload):
+        raise _credentials_exception()
+    try:
+        user_id = UUID(payload.get("sub"))
+    except (TypeError, ValueError):
+        raise _credentials_exception()
+    return payload, user_id
+
+
+async def _load_user(payload: dict, user_id: UUID, db: AsyncSession) -> User:
+    # Users are cached briefly so most requests skip this lookup
+    user = await get_cached_principal(user_id)
     if user is None:
-        raise credentials_exception
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if user is None:
+            raise _credentials_exception()
+        await cache_principal(user)
     
+    # Tokens issued before a role change or deactivation are no longer valid
+    if payload.get("ver") is not None and payload["ver"] < (user.auth_version or 0):
+        raise _credentials_exception()
     return user
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Get current authenticated user"""
+    payload, user_id = await _token_payload(credentials)
+    return await _load_user(payload, user_id, db)
+
+
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     """Get current active user"""
     if not current_user.is_active:
@@ -92,9 +167,69 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
     return current_user
 
 
+class Principal:
+    """Caller identity taken from the claims of a verified access token.
+
+    Stands in for the User row in handlers that only need ``id`` and
+    ``role``. Tokens are issued to active users only and deactivation bumps
+    the auth version, so a principal is always active.
+    """
+
+    is_active = True
+
+    def __init__(self, id: UUID, email: Optional[str], role: str):
+        self.id = id
+        self.email = email
+        self.role = role
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == "admin"
+
+    @property
+    def is_reviewer(self) -> bool:
+        return self.role == "reviewer"
+
+    @property
+    def is_candidate(self) -> bool:
+        return self.role == "candidate"
+
+
+async def _claims_principal(payload: dict, user_id: UUID) -> Optional[Principal]:
+    """Principal from the token alone, or None when the token must be checked
+    against the database (claims-only mode off, token too old or unstamped)"""
+    if not settings.AUTH_CLAIMS_ONLY:
+        return None
+    issued_at, version, role = payload.get("iat"), payload.get("ver"), payload.get("role")
+    if issued_at is None or version is None or role is None:
+        return None
+    if time.time() - issued_at > settings.CLAIMS_ONLY_MAX_TOKEN_AGE_SECONDS:
+        return None
+    if version < await auth_version_floor(user_id):
+        raise _credentials_exception()
+    return Principal(user_id, payload.get("email"), role)
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Union[Principal, User]:
+    """Get the caller for handlers that only read ``id`` and ``role``.
+    
+    With AUTH_CLAIMS_ONLY, recently issued tokens are authorized from their
+    signed claims without loading the user; otherwise this behaves like
+    get_current_active_user.
+    """
+    payload, user_id = await _token_payload(credentials)
+    principal = await _claims_principal(payload, user_id)
+    if principal is not None:
+        return principal
+    return await get_current_active_user(await _load_user(payload, user_id, db))
+
+
 def require_role(required_role: str):
     """Decorator to require specific role"""
-    def role_checker(current_user: User = Depends(get_current_active_user)) -> User:
+    def role_checker(current_user: User = Depends(get_current_principal)) -> User:
         if current_user.role != required_role and current_user.role != "admin":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -104,7 +239,7 @@ def require_role(required_role: str):
     return role_checker
 
 
-def require_admin(current_user: User = Depends(get_current_active_user)) -> User:
+def require_admin(current_user: User = Depends(get_current_principal)) -> User:
     """Require admin role"""
     if current_user.role != "admin":
         raise HTTPException(
@@ -114,7 +249,7 @@ def require_admin(current_user: User = Depends(get_current_active_user)) -> User
     return current_user
 
 
-def require_reviewer_or_admin(current_user: User = Depends(get_current_active_user)) -> User:
+def require_reviewer_or_admin(current_user: User = Depends(get_current_principal)) -> User:
     """Require reviewer or admin role"""
     if current_user.role not in ["admin", "reviewer"]:
         raise HTTPException(
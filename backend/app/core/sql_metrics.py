@@ -0,0 +1,184 @@
+import logging
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+
+from .config import settings
+
+logger = logging.getLogger("app.sql")
+
+# Placeholder lists such as IN (%(id_1)s, %(id_2)s) collapse to one shape whatever their length
+_PARAMETER_LIST = re.compile(r"\(\s*(?:%\(\w+\)s|\?|\$\d+|:\w+)(?:\s*,\s*(?:%\(\w+\)s|\?|\$\d+|:\w+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    return _PARAMETER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def _redact(parameters):
+    """Parameter types without their values, safe to log"""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"<{len(parameters)} parameter sets>"
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class RequestQueryStats:
+    """Statements executed while serving one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.shapes: Dict[str, int] = {}
+
+    def record(self, statement: str, elapsed_ms: float):
+        shape = statement_shape(statement)
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.shapes[shape] = self.shapes.get(shape, 0) + 1
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = shape
+
+
+class RouteQueryStats:
+    """Query statistics of every request to a route since startup"""
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.db_ms = 0.0
+        self.max_queries = 0
+        self.slowest_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.n_plus_one_warnings = 0
+
+    def add(self, stats: RequestQueryStats, n_plus_one: int):
+        self.requests += 1
+        self.queries += stats.count
+        self.db_ms += stats.total_ms
+        self.max_queries = max(self.max_queries, stats.count)
+        self.n_plus_one_warnings += n_plus_one
+        if stats.slowest_ms > self.slowest_ms:
+            self.slowest_ms = stats.slowest_ms
+            self.slowest_statement = stats.slowest_statement
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "queries": self.queries,
+            "avg_queries": round(self.queries / self.requests, 2) if self.requests else 0,
+            "max_queries": self.max_queries,
+            "db_ms": round(self.db_ms, 3),
+            "avg_db_ms": round(self.db_ms / self.requests, 3) if self.requests else 0,
+            "slowest_ms": round(self.slowest_ms, 3),
+            "slowest_statement": self.slowest_statement,
+            "n_plus_one_warnings": self.n_plus_one_warnings,
+        }
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("sql_request_stats", default=None)
+_route_stats: Dict[str, RouteQueryStats] = {}
+_route_stats_lock = threading.Lock()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_started_at"].pop()) * 1000
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+    if elapsed_ms >= settings.SQL_SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms): %s parameters=%s",
+            elapsed_ms, _WHITESPACE.sub(" ", statement).strip(), _redact(parameters)
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # Failed statements never reach after_cursor_execute
+    started = exception_context.connection.info.get("query_started_at") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def _route_label(scope) -> str:
+    """Method and path template of the matched route (the raw path when nothing matched)"""
+    app = scope.get("app")
+    for route in getattr(getattr(app, "router", None), "routes", []):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+    return f"{scope['method']} {scope['path']}"
+
+
+def route_query_stats() -> Dict[str, dict]:
+    with _route_stats_lock:
+        return {route: stats.snapshot() for route, stats in sorted(_route_stats.items())}
+
+
+class SQLInstrumentationMiddleware:
+    """Counts the statements behind each request and aggregates them per route.
+
+    In debug mode responses carry X-DB-Query-Count, X-DB-Time-Ms and
+    X-DB-Slowest-Ms. Statement shapes repeated more than
+    SQL_N_PLUS_ONE_THRESHOLD times in one request are logged as likely N+1
+    patterns. Streaming bodies may run queries after the headers are sent;
+    those still count towards the route totals.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(stats.count)
+                headers["X-DB-Time-Ms"] = f"{stats.total_ms:.1f}"
+                headers["X-DB-Slowest-Ms"] = f"{stats.slowest_ms:.1f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current_stats.reset(token)
+            self._finish(scope, stats)
+
+    def _finish(self, scope, stats: RequestQueryStats):
+        route = _route_label(scope)
+        repeated = {
+            shape: count for shape, count in stats.shapes.items()
+            if count > settings.SQL_N_PLUS_ONE_THRESHOLD
+        }
+        for shape, count in repeated.items():
+            logger.warning("Possible N+1 in %s: statement ran %d times: %s", route, count, shape)
+
+        with _route_stats_lock:
+            _route_stats.setdefault(route, RouteQueryStats()).add(stats, len(repeated))
@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .core.config import settings
 from .core.database import init_db
+from .core.sql_metrics import SQLInstrumentationMiddleware
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -9,6 +10,9 @@ app = FastAPI(
     description="Admin Panel API for Logbiz HR Recruitment"
 )
 
+# Per-request SQL statistics
+app.add_middleware(SQLInstrumentationMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
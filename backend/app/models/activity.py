@@ -0,0 +1,42 @@
+from sqlalchemy import Column, String, Date, Integer, DateTime
+from ..core.database import Base
+from .types import GUID
+
+# Activity metrics tracked per day
+METRIC_NEW_ASSIGNMENTS = "new_assignments"
+METRIC_SUBMISSIONS = "submissions"
+METRIC_REVIEWS = "reviews"
+METRIC_COMPLETIONS = "completions"
+METRIC_CERTIFICATES = "certificates"
+ACTIVITY_METRICS = [
+    METRIC_NEW_ASSIGNMENTS,
+    METRIC_SUBMISSIONS,
+    METRIC_REVIEWS,
+    METRIC_COMPLETIONS,
+    METRIC_CERTIFICATES,
+]
+
+ALL_SKILLSETS = ""  # skillset value of the per-project total bucket
+
+
+class ActivityBucket(Base):
+    __tablename__ = "activity_buckets"
+
+    metric = Column(String(50), primary_key=True)
+    day = Column(Date, primary_key=True)
+    project_id = Column(GUID(), primary_key=True)
+    skillset = Column(String(100), primary_key=True)  # ALL_SKILLSETS for the project total
+    value = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ActivityBucket(metric={self.metric}, day={self.day}, project_id={self.project_id}, skillset={self.skillset}, value={self.value})>"
+
+
+class JobWatermark(Base):
+    __tablename__ = "job_watermarks"
+
+    job_name = Column(String(100), primary_key=True)
+    last_run_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<JobWatermark(job_name={self.job_name}, last_run_at={self.last_run_at})>"
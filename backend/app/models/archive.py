@@ -0,0 +1,73 @@
+"""
+Archive tables for finished candidate assignments.
+
+Completed and failed candidate assignments are moved, together with their
+submissions and reviews, into tables of the same shape plus an archived_at
+stamp. The live tables keep only the rows status and deadline scans need;
+history, exports and all-time reports read both through with_archived().
+"""
+
+from sqlalchemy import Column, DateTime, Index, Table, select, union_all
+from sqlalchemy.sql import func
+
+from ..core.database import Base
+from .candidate_assignment import CandidateAssignment
+from .review import Review
+from .submission import Submission
+
+
+def _archive_table(live: Table, name: str, *indexes) -> Table:
+    """Same columns as the live table, without defaults or foreign keys, plus archived_at"""
+    columns = [
+        Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable)
+        for column in live.columns
+    ]
+    return Table(
+        name,
+        Base.metadata,
+        *columns,
+        Column("archived_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+        *indexes,
+    )
+
+
+candidate_assignments_archive = _archive_table(
+    CandidateAssignment.__table__,
+    "candidate_assignments_archive",
+    Index("ix_candidate_assignments_archive_candidate_id", "candidate_id"),
+    Index("ix_candidate_assignments_archive_assignment_id", "assignment_id"),
+)
+
+submissions_archive = _archive_table(
+    Submission.__table__,
+    "submissions_archive",
+    Index("ix_submissions_archive_candidate_assignment_id", "candidate_assignment_id"),
+)
+
+reviews_archive = _archive_table(
+    Review.__table__,
+    "reviews_archive",
+    Index("ix_reviews_archive_submission_id", "submission_id"),
+)
+
+# Live table name -> archive table
+ARCHIVE_TABLES = {
+    CandidateAssignment.__tablename__: candidate_assignments_archive,
+    Submission.__tablename__: submissions_archive,
+    Review.__tablename__: reviews_archive,
+}
+
+
+def with_archived(model):
+    """Live and archived rows of a model's table as one subquery.
+
+    The subquery has the live table's columns (``.c.status`` etc.) and is
+    named ``all_<table>``. Only for reads that cover finished work; hot
+    queries on open assignments should keep using the model directly.
+    """
+    live = model.__table__
+    archive = ARCHIVE_TABLES[live.name]
+    return union_all(
+        select(*live.columns),
+        select(*(archive.c[column.name] for column in live.columns)),
+    ).subquery(f"all_{live.name}")
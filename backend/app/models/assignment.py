@@ -1,19 +1,22 @@
-from sqlalchemy import Column, String, Text, DateTime, ARRAY, Boolean, Integer, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, DateTime, Boolean, Integer, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
 from ..core.database import Base
+from .types import GUID, StringArray
 
 
 class Assignment(Base):
     __tablename__ = "assignments"
+    __table_args__ = (
+        Index("ix_assignments_created_at_id", "created_at", "id"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False)
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    project_id = Column(GUID(), ForeignKey("projects.id"), nullable=False, index=True)
     title = Column(String(255), nullable=False, index=True)
     description = Column(Text)
-    skillsets = Column(ARRAY(String), nullable=False)  # Array of required skillsets
+    skillsets = Column(StringArray, nullable=False)  # Array of required skillsets
     difficulty_level = Column(String(50), nullable=False)  # beginner, intermediate, advanced
     duration_days = Column(Integer, nullable=False)
     instructions = Column(Text)
@@ -21,7 +24,7 @@ class Assignment(Base):
     reference_materials = Column(JSON)  # JSON object with links and resources
     submission_criteria = Column(JSON)  # JSON object with evaluation criteria
     is_active = Column(Boolean, default=True)
-    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    created_by = Column(GUID(), ForeignKey("users.id"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
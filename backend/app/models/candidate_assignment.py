@@ -1,21 +1,39 @@
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Boolean, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
+from typing import Optional
 import uuid
 from ..core.database import Base
+from .types import GUID
+
+# Statuses in which a candidate is still working on an assignment; a candidate
+# holds at most one such row per assignment
+ACTIVE_STATUSES = ("assigned", "in_progress")
+ACTIVE_PAIR_WHERE = text("status IN ('assigned', 'in_progress')")
 
 
 class CandidateAssignment(Base):
     __tablename__ = "candidate_assignments"
+    __table_args__ = (
+        Index("ix_candidate_assignments_assigned_at_id", "assigned_at", "id"),
+        Index("ix_candidate_assignments_candidate_id_status", "candidate_id", "status"),
+        Index("ix_candidate_assignments_status_deadline", "status", "deadline"),
+        Index(
+            "uq_candidate_assignments_active_pair", "candidate_id", "assignment_id",
+            unique=True, postgresql_where=ACTIVE_PAIR_WHERE, sqlite_where=ACTIVE_PAIR_WHERE,
+        ),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    candidate_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    assignment_id = Column(UUID(as_uuid=True), ForeignKey("assignments.id"), nullable=False)
-    assigned_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    candidate_id = Column(GUID(), ForeignKey("users.id"), nullable=False)
+    assignment_id = Column(GUID(), ForeignKey("assignments.id"), nullable=False, index=True)
+    assigned_by = Column(GUID(), ForeignKey("users.id"), nullable=False, index=True)
     assigned_at = Column(DateTime(timezone=True), server_default=func.now())
     deadline = Column(DateTime(timezone=True))
     status = Column(String(50), default="assigned")  # assigned, in_progress, submitted, reviewed, completed, failed
+    completed_at = Column(DateTime(timezone=True))  # Set when status becomes completed
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     progress_percentage = Column(Integer, default=0)
     notes = Column(String(1000))  # Admin notes about the assignment
     
@@ -28,16 +46,30 @@ class CandidateAssignment(Base):
     def __repr__(self):
         return f"<CandidateAssignment(id={self.id}, candidate_id={self.candidate_id}, assignment_id={self.assignment_id})>"
     
+    def set_status(self, status: str):
+        """Change status, stamping completed_at when the assignment completes"""
+        if status == "completed" and self.status != "completed":
+            self.completed_at = datetime.now(timezone.utc)
+        elif status != "completed":
+            self.completed_at = None
+        self.status = status
+    
+    @property
+    def deadline_utc(self) -> Optional[datetime]:
+        """Deadline as an aware UTC datetime (SQLite hands back naive UTC values)"""
+        if self.deadline is None or self.deadline.tzinfo is not None:
+            return self.deadline
+        return self.deadline.replace(tzinfo=timezone.utc)
+    
     @property
     def is_overdue(self) -> bool:
         if not self.deadline:
             return False
-        return func.now() > self.deadline and self.status not in ["completed", "failed"]
+        return datetime.now(timezone.utc) > self.deadline_utc and self.status not in ["completed", "failed"]
     
     @property
     def days_remaining(self) -> int:
         if not self.deadline:
             return 0
-        from datetime import datetime
-        remaining = self.deadline - datetime.utcnow()
+        remaining = self.deadline_utc - datetime.now(timezone.utc)
         return max(0, remaining.days) 
\ No newline at end of file
@@ -1,23 +1,30 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, ARRAY, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
 from ..core.database import Base
+from .types import GUID, StringArray
+
+PASSING_SCORE = 70  # 70% passing threshold
 
 
 class Certificate(Base):
     __tablename__ = "certificates"
+    __table_args__ = (
+        Index("ix_certificates_issued_at_id", "issued_at", "id"),
+        Index("ix_certificates_candidate_id_assignment_id", "candidate_id", "assignment_id"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    candidate_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    assignment_id = Column(UUID(as_uuid=True), ForeignKey("assignments.id"), nullable=False)
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    candidate_id = Column(GUID(), ForeignKey("users.id"), nullable=False)
+    assignment_id = Column(GUID(), ForeignKey("assignments.id"), nullable=False, index=True)
     certificate_number = Column(String(50), unique=True, nullable=False, index=True)
     score = Column(Integer)  # Final score from review
-    skills_demonstrated = Column(ARRAY(String), default=[])
+    skills_demonstrated = Column(StringArray, default=[])
     issued_at = Column(DateTime(timezone=True), server_default=func.now())
     pdf_url = Column(String(500))  # URL to generated PDF
     is_active = Column(Boolean, default=True)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     candidate = relationship("User", back_populates="certificates")
@@ -28,4 +35,4 @@ class Certificate(Base):
     
     @property
     def is_passing_score(self) -> bool:
-        return (self.score or 0) >= 70  # 70% passing threshold 
\ No newline at end of file
+        return (self.score or 0) >= PASSING_SCORE 
\ No newline at end of file
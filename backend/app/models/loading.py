@@ -0,0 +1,62 @@
+"""
+Relationship loading profiles.
+
+Each profile is a tuple of loader options for ``query.options(*PROFILE)``,
+matching the relationships one kind of response walks. Many-to-one hops are
+joined into the main query and collections are fetched with one extra
+SELECT ... IN per collection, so a page costs the same number of queries
+whatever its size.
+"""
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from .assignment import Assignment
+from .candidate_assignment import CandidateAssignment
+from .certificate import Certificate
+from .review import Review
+from .submission import Submission
+
+# Assignment listings showing their project
+ASSIGNMENT_WITH_PROJECT = (
+    joinedload(Assignment.project),
+)
+
+# Candidate assignment rows showing the candidate, assignment and project
+CANDIDATE_ASSIGNMENT_LIST = (
+    joinedload(CandidateAssignment.candidate),
+    joinedload(CandidateAssignment.assignment).joinedload(Assignment.project),
+)
+
+# Candidate assignment history: assignment and project plus every submission
+CANDIDATE_ASSIGNMENT_HISTORY = (
+    joinedload(CandidateAssignment.assignment).joinedload(Assignment.project),
+    selectinload(CandidateAssignment.submissions),
+)
+
+# Candidate and assignment used to issue a certificate
+CANDIDATE_ASSIGNMENT_CERTIFICATE = (
+    joinedload(CandidateAssignment.candidate),
+    joinedload(CandidateAssignment.assignment),
+)
+
+# Certificate listings and detail pages
+CERTIFICATE_DETAIL = (
+    joinedload(Certificate.candidate),
+    joinedload(Certificate.assignment).joinedload(Assignment.project),
+)
+
+# Review queue: who submitted what, for which assignment and project
+SUBMISSION_REVIEW_QUEUE = (
+    joinedload(Submission.candidate_assignment).joinedload(CandidateAssignment.candidate),
+    joinedload(Submission.candidate_assignment).joinedload(CandidateAssignment.assignment).joinedload(Assignment.project),
+)
+
+# Submission with its candidate assignment, for ownership checks and status updates
+SUBMISSION_WITH_ASSIGNMENT = (
+    joinedload(Submission.candidate_assignment),
+)
+
+# Reviews shown with their reviewer
+REVIEW_WITH_REVIEWER = (
+    joinedload(Review.reviewer),
+)
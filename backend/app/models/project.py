@@ -1,19 +1,22 @@
-from sqlalchemy import Column, String, Text, DateTime, ARRAY, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, DateTime, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
 from ..core.database import Base
+from .types import GUID, StringArray
 
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_created_at_id", "created_at", "id"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False, index=True)
     description = Column(Text)
     domain = Column(String(100))  # e.g., 'sports', 'e-commerce', 'finance'
-    tech_stack = Column(ARRAY(String), default=[])
+    tech_stack = Column(StringArray, default=[])
     difficulty_level = Column(String(50), nullable=False)  # beginner, intermediate, advanced
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -21,7 +24,6 @@ class Project(Base):
     
     # Relationships
     assignments = relationship("Assignment", back_populates="project")
-    certificates = relationship("Certificate", back_populates="assignment")
     
     def __repr__(self):
         return f"<Project(id={self.id}, name={self.name}, domain={self.domain})>" 
\ No newline at end of file
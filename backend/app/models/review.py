@@ -1,22 +1,26 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, JSON, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, JSON, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
 from ..core.database import Base
+from .types import GUID
 
 
 class Review(Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        Index("ix_reviews_submission_id_reviewer_id", "submission_id", "reviewer_id"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    submission_id = Column(UUID(as_uuid=True), ForeignKey("submissions.id"), nullable=False)
-    reviewer_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    submission_id = Column(GUID(), ForeignKey("submissions.id"), nullable=False)
+    reviewer_id = Column(GUID(), ForeignKey("users.id"), nullable=False, index=True)
     score = Column(Integer)  # Overall score (0-100)
     feedback = Column(Text)  # General feedback
     criteria_scores = Column(JSON)  # Detailed scoring by criteria
     reviewed_at = Column(DateTime(timezone=True), server_default=func.now())
     status = Column(String(50), default="pending")  # pending, in_progress, completed
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     submission = relationship("Submission", back_populates="reviews")
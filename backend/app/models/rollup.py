@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, Date, Integer
+from ..core.database import Base
+from .types import GUID
+
+# Rollup metrics
+METRIC_CANDIDATE_ASSIGNMENTS = "candidate_assignments"  # status is the candidate assignment status
+METRIC_CERTIFICATES = "certificates"  # status is "passing" or "failing"
+
+
+class RollupCounter(Base):
+    __tablename__ = "rollup_counters"
+
+    metric = Column(String(50), primary_key=True)
+    project_id = Column(GUID(), primary_key=True)
+    assignment_id = Column(GUID(), primary_key=True)
+    status = Column(String(50), primary_key=True)
+    day = Column(Date, primary_key=True)  # assigned day for assignments, issued day for certificates
+    value = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<RollupCounter(metric={self.metric}, assignment_id={self.assignment_id}, status={self.status}, day={self.day}, value={self.value})>"
@@ -1,22 +1,26 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
 from ..core.database import Base
+from .types import GUID
 
 
 class Submission(Base):
     __tablename__ = "submissions"
+    __table_args__ = (
+        Index("ix_submissions_status_submitted_at_id", "status", "submitted_at", "id"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    candidate_assignment_id = Column(UUID(as_uuid=True), ForeignKey("candidate_assignments.id"), nullable=False)
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    candidate_assignment_id = Column(GUID(), ForeignKey("candidate_assignments.id"), nullable=False, index=True)
     submission_type = Column(String(50), nullable=False)  # github_pr, file_upload
     submission_url = Column(String(500))  # For GitHub PRs
     files = Column(JSON)  # For file uploads: [{"name": "file.zip", "url": "s3://..."}]
     submitted_at = Column(DateTime(timezone=True), server_default=func.now())
-    status = Column(String(50), default="submitted")  # submitted, under_review, approved, rejected, resubmission_required
+    status = Column(String(50), default="submitted", index=True)  # submitted, under_review, approved, rejected, resubmission_required
     notes = Column(Text)  # Candidate notes about the submission
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     candidate_assignment = relationship("CandidateAssignment", back_populates="submissions")
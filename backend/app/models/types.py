@@ -0,0 +1,100 @@
+"""
+Column types that work on both Postgres and SQLite.
+
+Postgres keeps its native UUID and VARCHAR[] columns; SQLite stores UUIDs
+as 36-character strings and string arrays as JSON documents.
+"""
+
+import uuid
+
+from sqlalchemy import Boolean, CHAR, JSON, String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import functions
+from sqlalchemy.sql.expression import ColumnElement, literal
+from sqlalchemy.sql.visitors import InternalTraversal
+from sqlalchemy.types import TypeDecorator
+
+
+class GUID(TypeDecorator):
+    """UUID column: native UUID on Postgres, CHAR(36) elsewhere"""
+
+    impl = CHAR(36)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+        return dialect.type_descriptor(CHAR(36))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        return str(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        return uuid.UUID(value)
+
+
+@compiles(functions.now, "sqlite")
+def _now_sqlite(element, compiler, **kw):
+    """CURRENT_TIMESTAMP has whole seconds; match the microsecond text SQLAlchemy
+    stores for datetimes so server defaults compare and sort with bound values"""
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+class array_contains(ColumnElement):
+    """True when an array column holds every one of the given strings"""
+
+    type = Boolean()
+    inherit_cache = True
+    _traverse_internals = [
+        ("column", InternalTraversal.dp_clauseelement),
+        ("values", InternalTraversal.dp_clauseelement_list),
+    ]
+
+    def __init__(self, column, values):
+        self.column = column
+        self.values = [literal(value, String) for value in dict.fromkeys(values)]
+
+
+@compiles(array_contains, "postgresql")
+def _array_contains_postgresql(element, compiler, **kw):
+    values = ", ".join(compiler.process(value, **kw) for value in element.values)
+    return f"{compiler.process(element.column, **kw)} @> ARRAY[{values}]::VARCHAR[]"
+
+
+@compiles(array_contains)
+def _array_contains_json(element, compiler, **kw):
+    values = ", ".join(compiler.process(value, **kw) for value in element.values)
+    return (
+        f"((SELECT count(DISTINCT value) FROM json_each({compiler.process(element.column, **kw)}) "
+        f"WHERE value IN ({values})) = {len(element.values)})"
+    )
+
+
+class StringArray(TypeDecorator):
+    """List of strings: VARCHAR[] on Postgres, a JSON array elsewhere.
+
+    ``column.contains([...])`` matches rows holding every given value on
+    both backends.
+    """
+
+    impl = JSON
+    cache_ok = True
+
+    class comparator_factory(TypeDecorator.Comparator):
+        def contains(self, other, **kwargs):
+            return array_contains(self.expr, other)
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.ARRAY(String))
+        return dialect.type_descriptor(JSON())
+
+    def process_result_value(self, value, dialect):
+        return list(value) if value is not None else None
@@ -1,21 +1,25 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Text, ARRAY
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
 from ..core.database import Base
+from .types import GUID, StringArray
 
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_role_created_at_id", "role", "created_at", "id"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
     email = Column(String(255), unique=True, nullable=False, index=True)
     full_name = Column(String(255), nullable=False)
     password_hash = Column(String(255), nullable=False)
-    role = Column(String(50), nullable=False, default="candidate")  # admin, reviewer, candidate
-    skillsets = Column(ARRAY(String), default=[])  # Array of skillsets
+    role = Column(String(50), nullable=False, default="candidate", index=True)  # admin, reviewer, candidate
+    skillsets = Column(StringArray, default=[])  # Array of skillsets
     is_active = Column(Boolean, default=True)
+    auth_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped to invalidate issued access tokens
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, model_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
@@ -8,7 +8,7 @@ class AssignmentBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=255)
     description: Optional[str] = None
     skillsets: List[str] = Field(..., min_items=1)
-    difficulty_level: str = Field(..., regex="^(beginner|intermediate|advanced)$")
+    difficulty_level: str = Field(..., pattern="^(beginner|intermediate|advanced)$")
     duration_days: int = Field(..., gt=0, le=30)
     instructions: Optional[str] = None
     starter_code_url: Optional[HttpUrl] = None
@@ -24,7 +24,7 @@ class AssignmentUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = None
     skillsets: Optional[List[str]] = Field(None, min_items=1)
-    difficulty_level: Optional[str] = Field(None, regex="^(beginner|intermediate|advanced)$")
+    difficulty_level: Optional[str] = Field(None, pattern="^(beginner|intermediate|advanced)$")
     duration_days: Optional[int] = Field(None, gt=0, le=30)
     instructions: Optional[str] = None
     starter_code_url: Optional[HttpUrl] = None
@@ -50,7 +50,7 @@ class Assignment(AssignmentInDB):
 
 
 class AssignmentWithProject(Assignment):
-    project_name: str
+    project_name: Optional[str] = None  # Filled in by the handler after validation
     project_domain: Optional[str] = None
 
 
@@ -58,4 +58,20 @@ class AssignmentWithStats(Assignment):
     total_candidates: int = 0
     completed_count: int = 0
     in_progress_count: int = 0
-    overdue_count: int = 0 
\ No newline at end of file
+    overdue_count: int = 0
+
+
+class BulkAssignmentCreate(BaseModel):
+    """Assign one or more assignments to a list of candidates, or to every
+    candidate holding all of the given skillsets"""
+    assignment_ids: List[UUID] = Field(..., min_length=1, max_length=50)
+    candidate_ids: Optional[List[UUID]] = Field(None, min_length=1, max_length=2000)
+    skillsets: Optional[List[str]] = Field(None, min_length=1)
+    deadline_days: int = Field(7, ge=1, le=30)
+    notes: Optional[str] = Field(None, max_length=1000)
+
+    @model_validator(mode="after")
+    def one_candidate_selector(self):
+        if (self.candidate_ids is None) == (self.skillsets is None):
+            raise ValueError("Provide either candidate_ids or skillsets")
+        return self
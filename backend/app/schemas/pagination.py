@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """One page of a list endpoint in cursor mode"""
+    items: List[T]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for the next page; null on the last page
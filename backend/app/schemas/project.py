@@ -9,7 +9,7 @@ class ProjectBase(BaseModel):
     description: Optional[str] = None
     domain: Optional[str] = Field(None, max_length=100)
     tech_stack: List[str] = Field(default_factory=list)
-    difficulty_level: str = Field(..., regex="^(beginner|intermediate|advanced)$")
+    difficulty_level: str = Field(..., pattern="^(beginner|intermediate|advanced)$")
 
 
 class ProjectCreate(ProjectBase):
@@ -21,7 +21,7 @@ class ProjectUpdate(BaseModel):
     description: Optional[str] = None
     domain: Optional[str] = Field(None, max_length=100)
     tech_stack: Optional[List[str]] = None
-    difficulty_level: Optional[str] = Field(None, regex="^(beginner|intermediate|advanced)$")
+    difficulty_level: Optional[str] = Field(None, pattern="^(beginner|intermediate|advanced)$")
     is_active: Optional[bool] = None
 
 
@@ -0,0 +1,32 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Dict, Any
+
+# Bounds shared by the report routes and the report job parameters
+EXPORT_FORMAT_PATTERN = "^(csv|ndjson)$"
+PERFORMANCE_DEFAULT_LIMIT = 100
+PERFORMANCE_MAX_LIMIT = 1000
+
+
+class ReportJobCreate(BaseModel):
+    report: str = Field(..., pattern="^(candidate_performance|projects_summary|candidates_export)$")
+    params: Optional[Dict[str, Any]] = None
+
+
+class ReportParams(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+
+class CandidatePerformanceParams(ReportParams):
+    skillset: Optional[str] = None
+    min_assignments: int = Field(1, ge=1)
+    limit: int = Field(PERFORMANCE_DEFAULT_LIMIT, ge=1, le=PERFORMANCE_MAX_LIMIT)
+    cursor: Optional[str] = None
+
+
+class ProjectsSummaryParams(ReportParams):
+    domain: Optional[str] = None
+    difficulty_level: Optional[str] = None
+
+
+class CandidatesExportParams(ReportParams):
+    format: str = Field("csv", pattern=EXPORT_FORMAT_PATTERN)
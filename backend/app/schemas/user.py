@@ -12,7 +12,7 @@ class UserBase(BaseModel):
 
 class UserCreate(UserBase):
     password: str = Field(..., min_length=8)
-    role: str = Field(default="candidate", regex="^(admin|reviewer|candidate)$")
+    role: str = Field(default="candidate", pattern="^(admin|reviewer|candidate)$")
 
 
 class UserUpdate(BaseModel):
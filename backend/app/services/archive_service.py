@@ -0,0 +1,107 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.archive import candidate_assignments_archive, reviews_archive, submissions_archive
+from ..models.assignment import Assignment
+from ..models.candidate_assignment import CandidateAssignment
+from ..models.project import Project
+from ..models.review import Review
+from ..models.submission import Submission
+
+TERMINAL_STATUSES = ("completed", "failed")
+# Submissions still waiting for a reviewer keep their assignment live
+OPEN_SUBMISSION_STATUSES = ("submitted", "under_review")
+
+
+def _eligible(cutoff: datetime):
+    """Criteria for candidate assignments that finished before cutoff"""
+    open_submission = select(Submission.id).where(
+        Submission.candidate_assignment_id == CandidateAssignment.id,
+        Submission.status.in_(OPEN_SUBMISSION_STATUSES),
+    ).exists()
+    finished_at = func.coalesce(
+        CandidateAssignment.completed_at, CandidateAssignment.updated_at, CandidateAssignment.assigned_at
+    )
+    return [
+        CandidateAssignment.status.in_(TERMINAL_STATUSES),
+        finished_at < cutoff,
+        ~open_submission,
+    ]
+
+
+def _move(db: Session, live, archive, criteria) -> int:
+    """Copy matching rows into the archive table (archived_at defaults to now) and delete them"""
+    columns = [column.name for column in live.columns]
+    db.execute(insert(archive).from_select(columns, select(*live.columns).where(criteria)))
+    return db.execute(delete(live).where(criteria)).rowcount
+
+
+def archive_finished_assignments(
+    db: Session,
+    older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """Move finished candidate assignments with their submissions and reviews
+    into the archive tables, one committed batch at a time.
+
+    Returns the number of rows moved per table (with dry_run, the number of
+    candidate assignments that would move). Rows are locked with SKIP LOCKED
+    so a concurrent status update is never archived halfway.
+    """
+    older_than_days = settings.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    criteria = _eligible(datetime.now(timezone.utc) - timedelta(days=older_than_days))
+
+    if dry_run:
+        count = db.query(func.count(CandidateAssignment.id)).filter(*criteria).scalar()
+        db.rollback()
+        return {"candidate_assignments": count}
+
+    moved = {"candidate_assignments": 0, "submissions": 0, "reviews": 0}
+    while True:
+        ids = db.execute(
+            select(CandidateAssignment.id).where(*criteria).limit(batch_size).with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not ids:
+            break
+        submission_ids = select(Submission.id).where(Submission.candidate_assignment_id.in_(ids))
+        # Children first so foreign keys hold at every step
+        moved["reviews"] += _move(db, Review.__table__, reviews_archive, Review.submission_id.in_(submission_ids))
+        moved["submissions"] += _move(
+            db, Submission.__table__, submissions_archive, Submission.candidate_assignment_id.in_(ids)
+        )
+        moved["candidate_assignments"] += _move(
+            db, CandidateAssignment.__table__, candidate_assignments_archive, CandidateAssignment.id.in_(ids)
+        )
+        db.commit()
+    return moved
+
+
+def archived_assignment_history(db: Session, candidate_id: UUID) -> List[Tuple]:
+    """Archived candidate assignments of a candidate as (row, submission rows)
+    pairs; rows also carry the assignment ``title`` and project ``name``"""
+    archive = candidate_assignments_archive
+    rows = db.execute(
+        select(archive, Assignment.title, Project.name)
+        .join(Assignment, Assignment.id == archive.c.assignment_id)
+        .join(Project, Project.id == Assignment.project_id)
+        .where(archive.c.candidate_id == candidate_id)
+    ).all()
+    if not rows:
+        return []
+
+    submissions = defaultdict(list)
+    for submission in db.execute(
+        select(submissions_archive).where(
+            submissions_archive.c.candidate_assignment_id.in_([row.id for row in rows])
+        )
+    ):
+        submissions[submission.candidate_assignment_id].append(submission)
+    return [(row, submissions[row.id]) for row in rows]
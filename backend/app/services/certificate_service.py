@@ -10,7 +10,7 @@ import boto3
 from ..core.config import settings
 
 
-async def generate_certificate_pdf(candidate, assignment, score, certificate_number):
+def generate_certificate_pdf(candidate, assignment, score, certificate_number):
     """Generate a PDF certificate for a completed assignment"""
     
     # Create PDF filename
@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+import redis
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from ..core.cache import get_redis, mark_redis_down
+from ..core.config import settings
+from ..schemas.report import (
+    CandidatePerformanceParams, CandidatesExportParams, ProjectsSummaryParams, ReportParams
+)
+from .report_service import candidate_performance, projects_summary, write_candidates_export
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+def _candidates_export(db: Session, job_id: str, format: str = "csv") -> dict:
+    # format was validated against CandidatesExportParams before the job was queued
+    os.makedirs(settings.REPORT_EXPORT_DIR, exist_ok=True)
+    filename = f"candidates_report_{datetime.utcnow().strftime('%Y%m%d')}.{format}.gz"
+    path = os.path.join(settings.REPORT_EXPORT_DIR, f"{job_id}.{format}.gz")
+    rows = write_candidates_export(path, format)
+    return {
+        "path": path,
+        "filename": filename,
+        "media_type": "application/gzip",
+        "rows": rows
+    }
+
+
+# Report name -> (builder, parameter model). Builders take the session and
+# job id followed by the validated report parameters.
+REPORTS: Dict[str, Tuple[Callable[..., Any], Type[ReportParams]]] = {
+    "candidate_performance": (
+        lambda db, job_id, **params: candidate_performance(db, **params),
+        CandidatePerformanceParams,
+    ),
+    "projects_summary": (
+        lambda db, job_id, **params: projects_summary(db, **params),
+        ProjectsSummaryParams,
+    ),
+    "candidates_export": (_candidates_export, CandidatesExportParams),
+}
+
+
+def _job_id(report: str, params: dict) -> str:
+    """Jobs are identified by their report and parameters, so identical requests share one"""
+    canonical = json.dumps({"report": report, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+
+def _meta_key(job_id: str) -> str:
+    return f"report-jobs:{job_id}"
+
+
+def _result_key(job_id: str) -> str:
+    return f"report-jobs:{job_id}:result"
+
+
+def _lock_key(job_id: str) -> str:
+    return f"report-jobs:{job_id}:lock"
+
+
+def _jobs_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Report jobs are unavailable"
+    )
+
+
+def _require_redis() -> redis.Redis:
+    client = get_redis()
+    if client is None:
+        raise _jobs_unavailable()
+    return client
+
+
+def submit_report_job(report: str, params: Optional[dict]) -> dict:
+    """Queue a report job, or attach to the running or cached job with the same parameters"""
+    if report not in REPORTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown report. Available: {', '.join(REPORTS)}"
+        )
+    params = {key: value for key, value in (params or {}).items() if value is not None}
+    try:
+        # Defaults are filled in, so equivalent requests hash to the same job
+        params = REPORTS[report][1].model_validate(params).model_dump(exclude_none=True)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=jsonable_encoder(e.errors(include_url=False))
+        )
+
+    job_id = _job_id(report, params)
+    client = _require_redis()
+    try:
+        if not client.exists(_result_key(job_id)) and client.set(
+            _lock_key(job_id), "1", nx=True, ex=settings.REPORT_JOB_TIMEOUT_SECONDS
+        ):
+            client.hset(_meta_key(job_id), mapping={
+                "report": report,
+                "params": json.dumps(params, default=str),
+                "status": JOB_QUEUED,
+                "error": "",
+                "submitted_at": datetime.utcnow().isoformat()
+            })
+            client.expire(_meta_key(job_id), settings.REPORT_JOB_TIMEOUT_SECONDS + settings.REPORT_RESULT_TTL_SECONDS)
+
+            from ..tasks import run_report_job
+            run_report_job.delay(job_id, report, params)
+    except redis.RedisError:
+        mark_redis_down()
+        raise _jobs_unavailable()
+
+    return get_report_job(job_id)
+
+
+def get_report_job(job_id: str) -> dict:
+    """Get the status of a report job"""
+    try:
+        meta = _require_redis().hgetall(_meta_key(job_id))
+    except redis.RedisError:
+        mark_redis_down()
+        raise _jobs_unavailable()
+    if not meta:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report job not found"
+        )
+    return {
+        "job_id": job_id,
+        "report": meta["report"],
+        "params": json.loads(meta["params"]),
+        "status": meta["status"],
+        "error": meta["error"] or None,
+        "submitted_at": meta["submitted_at"]
+    }
+
+
+def get_report_result(job_id: str) -> Any:
+    """Get the cached result of a completed report job"""
+    job = get_report_job(job_id)
+    if job["status"] != JOB_COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Report job is {job['status']}"
+        )
+    try:
+        raw = _require_redis().get(_result_key(job_id))
+    except redis.RedisError:
+        mark_redis_down()
+        raise _jobs_unavailable()
+    if raw is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report result expired"
+        )
+    return json.loads(raw)
+
+
+def run_report(db: Session, job_id: str, report: str, params: dict):
+    """Build a report inside the worker and cache its result under the job id"""
+    client = get_redis()
+    if client is None:
+        raise RuntimeError("Redis is unavailable")
+    client.hset(_meta_key(job_id), "status", JOB_RUNNING)
+    try:
+        builder = REPORTS[report][0]
+        result = builder(db, job_id, **params)
+        client.set(_result_key(job_id), json.dumps(result, default=str), ex=settings.REPORT_RESULT_TTL_SECONDS)
+        client.hset(_meta_key(job_id), "status", JOB_COMPLETED)
+        client.expire(_meta_key(job_id), settings.REPORT_RESULT_TTL_SECONDS)
+    except Exception as e:
+        client.hset(_meta_key(job_id), mapping={"status": JOB_FAILED, "error": str(e)})
+        client.expire(_meta_key(job_id), settings.REPORT_RESULT_TTL_SECONDS)
+        raise
+    finally:
+        client.delete(_lock_key(job_id))
+
+
+def remove_expired_exports() -> int:
+    """Delete export files older than the result TTL whose job result is gone.
+
+    Files are named after their job id, so a file whose job was rebuilt and
+    still has a cached result is kept. Returns the number of files deleted.
+    """
+    if not os.path.isdir(settings.REPORT_EXPORT_DIR):
+        return 0
+    client = get_redis()
+    cutoff = time.time() - settings.REPORT_RESULT_TTL_SECONDS
+    removed = 0
+    for entry in os.scandir(settings.REPORT_EXPORT_DIR):
+        if not entry.is_file() or entry.stat().st_mtime >= cutoff:
+            continue
+        if client is not None:
+            try:
+                if client.exists(_result_key(entry.name.split(".", 1)[0])):
+                    continue
+            except redis.RedisError:
+                mark_redis_down()
+                client = None
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            continue
+        removed += 1
+    return removed
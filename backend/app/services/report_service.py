@@ -0,0 +1,307 @@
+import csv
+import io
+import json
+import zlib
+from decimal import Decimal, InvalidOperation
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session
+
+from ..core.database import SessionLocal
+from ..core.pagination import encode_cursor, decode_cursor, invalid_cursor
+from ..models.archive import with_archived
+from ..models.assignment import Assignment
+from ..models.candidate_assignment import CandidateAssignment
+from ..models.certificate import Certificate
+from ..models.project import Project
+from ..models.rollup import RollupCounter, METRIC_CANDIDATE_ASSIGNMENTS
+from ..models.user import User
+from .rollup_service import sum_counter_value
+
+# Candidate export streaming
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 64 * 1024
+EXPORT_FIELDS = [
+    "id", "name", "email", "skillsets", "total_assignments", "completed_assignments",
+    "certificates_earned", "completion_rate", "created_at"
+]
+
+
+def candidate_performance(
+    db: Session,
+    skillset: Optional[str] = None,
+    min_assignments: int = 1,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> dict:
+    """Candidate performance page ranked by average certificate score"""
+    ranked = _ranked_candidates_query(db, skillset, min_assignments).subquery()
+    
+    page_query = db.query(ranked)
+    if cursor:
+        average_score, candidate_id = decode_cursor(cursor, 2)
+        try:
+            position = (Decimal(average_score), UUID(candidate_id))
+        except (TypeError, ValueError, InvalidOperation):
+            raise invalid_cursor()
+        page_query = page_query.filter(
+            tuple_(ranked.c.average_score, ranked.c.candidate_id) < tuple_(*position)
+        )
+    rows = page_query.order_by(
+        ranked.c.average_score.desc(), ranked.c.candidate_id.desc()
+    ).limit(limit + 1).all()
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    if rows:
+        total_candidates = rows[0].total_candidates
+    else:
+        total_candidates = db.query(func.count()).select_from(ranked).scalar()
+    
+    if not cursor and len(rows) >= 10:
+        top_rows = rows[:10]
+    else:
+        top_rows = db.query(ranked).filter(ranked.c.rank <= 10).order_by(
+            ranked.c.average_score.desc(), ranked.c.candidate_id.desc()
+        ).limit(10).all()
+    
+    return {
+        "total_candidates": total_candidates,
+        "top_performers": [_performance_row(row) for row in top_rows],
+        "performance_data": [_performance_row(row) for row in rows],
+        "next_cursor": encode_cursor([rows[-1].average_score, rows[-1].candidate_id]) if has_more else None
+    }
+
+
+def _assignment_stats(db: Session):
+    """Per-candidate total and completed assignment counts, archived ones included"""
+    candidate_assignments = with_archived(CandidateAssignment)
+    return db.query(
+        candidate_assignments.c.candidate_id.label("candidate_id"),
+        func.count(candidate_assignments.c.id).label("total_assignments"),
+        func.count(candidate_assignments.c.id).filter(
+            candidate_assignments.c.status == "completed"
+        ).label("completed_assignments"),
+    ).group_by(candidate_assignments.c.candidate_id).subquery()
+
+
+def _ranked_candidates_query(db: Session, skillset: Optional[str], min_assignments: int):
+    """Per-candidate assignment and certificate aggregates ranked by average score"""
+    assignment_stats = _assignment_stats(db)
+    
+    certificate_stats = db.query(
+        Certificate.candidate_id.label("candidate_id"),
+        func.count(Certificate.id).label("certificates_earned"),
+        func.avg(func.coalesce(Certificate.score, 0)).label("average_score"),
+    ).group_by(Certificate.candidate_id).subquery()
+    
+    average_score = func.round(func.coalesce(certificate_stats.c.average_score, 0), 2)
+    query = db.query(
+        User.id.label("candidate_id"),
+        User.full_name,
+        User.email,
+        User.skillsets,
+        assignment_stats.c.total_assignments,
+        assignment_stats.c.completed_assignments,
+        func.round(
+            assignment_stats.c.completed_assignments * 100.0 / assignment_stats.c.total_assignments, 2
+        ).label("completion_rate"),
+        average_score.label("average_score"),
+        func.coalesce(certificate_stats.c.certificates_earned, 0).label("certificates_earned"),
+        func.rank().over(order_by=average_score.desc()).label("rank"),
+        func.count().over().label("total_candidates"),
+    ).join(
+        assignment_stats, assignment_stats.c.candidate_id == User.id
+    ).outerjoin(
+        certificate_stats, certificate_stats.c.candidate_id == User.id
+    ).filter(
+        User.role == "candidate",
+        assignment_stats.c.total_assignments >= min_assignments
+    )
+    
+    if skillset:
+        query = query.filter(User.skillsets.contains([skillset]))
+    
+    return query
+
+
+def _performance_row(row) -> dict:
+    return {
+        "rank": row.rank,
+        "candidate_id": row.candidate_id,
+        "candidate_name": row.full_name,
+        "candidate_email": row.email,
+        "total_assignments": row.total_assignments,
+        "completed_assignments": row.completed_assignments,
+        "completion_rate": float(row.completion_rate),
+        "average_score": float(row.average_score),
+        "certificates_earned": row.certificates_earned,
+        "skillsets": row.skillsets
+    }
+
+
+def projects_summary(
+    db: Session,
+    domain: Optional[str] = None,
+    difficulty_level: Optional[str] = None
+) -> dict:
+    """Per-project assignment statistics from the rollup counters"""
+    assignment_counts = db.query(
+        Assignment.project_id.label("project_id"),
+        func.count(Assignment.id).label("total_assignments"),
+    ).group_by(Assignment.project_id).subquery()
+    
+    status_counts = db.query(
+        RollupCounter.project_id.label("project_id"),
+        sum_counter_value().label("assigned_count"),
+        sum_counter_value(RollupCounter.status == "completed").label("completed_count"),
+        sum_counter_value(RollupCounter.status == "in_progress").label("in_progress_count"),
+    ).filter(
+        RollupCounter.metric == METRIC_CANDIDATE_ASSIGNMENTS
+    ).group_by(RollupCounter.project_id).subquery()
+    
+    query = db.query(
+        Project.id,
+        Project.name,
+        Project.domain,
+        Project.difficulty_level,
+        func.coalesce(assignment_counts.c.total_assignments, 0).label("total_assignments"),
+        func.coalesce(status_counts.c.assigned_count, 0).label("assigned_count"),
+        func.coalesce(status_counts.c.completed_count, 0).label("completed_count"),
+        func.coalesce(status_counts.c.in_progress_count, 0).label("in_progress_count"),
+    ).outerjoin(
+        assignment_counts, assignment_counts.c.project_id == Project.id
+    ).outerjoin(
+        status_counts, status_counts.c.project_id == Project.id
+    ).filter(Project.is_active == True)
+    
+    if domain:
+        query = query.filter(Project.domain == domain)
+    if difficulty_level:
+        query = query.filter(Project.difficulty_level == difficulty_level)
+    
+    project_summary = []
+    for row in query.order_by(Project.name):
+        project_summary.append({
+            "project_id": row.id,
+            "project_name": row.name,
+            "domain": row.domain,
+            "difficulty_level": row.difficulty_level,
+            "total_assignments": row.total_assignments,
+            "assigned_count": row.assigned_count,
+            "completed_count": row.completed_count,
+            "in_progress_count": row.in_progress_count,
+            "completion_rate": round((row.completed_count / row.assigned_count * 100) if row.assigned_count > 0 else 0, 2)
+        })
+    
+    return {
+        "total_projects": len(project_summary),
+        "projects": project_summary
+    }
+
+
+def iter_candidate_export_rows():
+    """Yield export rows through a server-side cursor in its own session.
+    
+    The session outlives the request handler, so it cannot come from get_db.
+    """
+    db = SessionLocal()
+    try:
+        assignment_stats = _assignment_stats(db)
+        
+        certificate_stats = db.query(
+            Certificate.candidate_id.label("candidate_id"),
+            func.count(Certificate.id).label("certificates_earned"),
+        ).group_by(Certificate.candidate_id).subquery()
+        
+        query = db.query(
+            User.id,
+            User.full_name,
+            User.email,
+            User.skillsets,
+            User.created_at,
+            func.coalesce(assignment_stats.c.total_assignments, 0).label("total_assignments"),
+            func.coalesce(assignment_stats.c.completed_assignments, 0).label("completed_assignments"),
+            func.coalesce(certificate_stats.c.certificates_earned, 0).label("certificates_earned"),
+        ).outerjoin(
+            assignment_stats, assignment_stats.c.candidate_id == User.id
+        ).outerjoin(
+            certificate_stats, certificate_stats.c.candidate_id == User.id
+        ).filter(
+            User.role == "candidate"
+        ).order_by(User.created_at, User.id).yield_per(EXPORT_BATCH_SIZE)
+        
+        for row in query:
+            yield {
+                "id": str(row.id),
+                "name": row.full_name,
+                "email": row.email,
+                "skillsets": ", ".join(row.skillsets or []),
+                "total_assignments": row.total_assignments,
+                "completed_assignments": row.completed_assignments,
+                "certificates_earned": row.certificates_earned,
+                "completion_rate": round((row.completed_assignments / row.total_assignments * 100) if row.total_assignments else 0, 2),
+                "created_at": row.created_at.isoformat() if row.created_at else None
+            }
+    finally:
+        db.close()
+
+
+def encode_csv(rows):
+    """Encode export rows as CSV text chunks"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def encode_ndjson(rows):
+    """Encode export rows as NDJSON text chunks"""
+    lines = []
+    size = 0
+    for row in rows:
+        line = json.dumps(row) + "\n"
+        lines.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_SIZE:
+            yield "".join(lines)
+            lines = []
+            size = 0
+    yield "".join(lines)
+
+
+def gzip_chunks(chunks):
+    """Gzip-compress text chunks incrementally"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def write_candidates_export(path: str, format: str = "csv") -> int:
+    """Write the gzip-compressed candidates export to path and return the row count"""
+    row_count = 0
+    
+    def counted(rows):
+        nonlocal row_count
+        for row in rows:
+            row_count += 1
+            yield row
+    
+    rows = counted(iter_candidate_export_rows())
+    chunks = encode_csv(rows) if format == "csv" else encode_ndjson(rows)
+    with open(path, "wb") as output:
+        for data in gzip_chunks(chunks):
+            output.write(data)
+    return row_count
@@ -0,0 +1,200 @@
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, case, func, literal, text
+from sqlalchemy.orm import Session
+
+from ..core.database import dialect_insert
+from ..models.archive import with_archived
+from ..models.assignment import Assignment
+from ..models.candidate_assignment import CandidateAssignment
+from ..models.certificate import Certificate, PASSING_SCORE
+from ..models.rollup import RollupCounter, METRIC_CANDIDATE_ASSIGNMENTS, METRIC_CERTIFICATES
+
+RollupKey = Tuple[str, UUID, UUID, str, date]
+
+
+def _day(timestamp: Optional[datetime]) -> date:
+    """UTC calendar day of a timestamp (today for rows not yet flushed)"""
+    if timestamp is None:
+        return datetime.utcnow().date()
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+    return timestamp.date()
+
+
+def _bump(db: Session, key: RollupKey, delta: int):
+    """Add delta to a counter in the caller's transaction"""
+    _bump_many(db, {key: delta})
+
+
+def _bump_many(db: Session, deltas: Dict[RollupKey, int]):
+    """Add several deltas with one multi-row upsert in the caller's transaction"""
+    if not deltas:
+        return
+    stmt = dialect_insert(db, RollupCounter).values([
+        {
+            "metric": metric,
+            "project_id": project_id,
+            "assignment_id": assignment_id,
+            "status": status,
+            "day": day,
+            "value": delta,
+        }
+        for (metric, project_id, assignment_id, status, day), delta in deltas.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["metric", "project_id", "assignment_id", "status", "day"],
+        set_={"value": RollupCounter.value + stmt.excluded.value},
+    )
+    db.execute(stmt)
+
+
+def record_assignment_created(db: Session, candidate_assignment: CandidateAssignment, project_id: UUID):
+    """Count a new candidate assignment"""
+    _bump(db, (
+        METRIC_CANDIDATE_ASSIGNMENTS,
+        project_id,
+        candidate_assignment.assignment_id,
+        candidate_assignment.status or "assigned",
+        _day(candidate_assignment.assigned_at),
+    ), 1)
+
+
+def record_assignments_created(db: Session, created: Iterable[Tuple[UUID, UUID, datetime]]):
+    """Count a batch of new candidate assignments given as
+    (assignment_id, project_id, assigned_at) tuples"""
+    deltas: Dict[RollupKey, int] = {}
+    for assignment_id, project_id, assigned_at in created:
+        key = (METRIC_CANDIDATE_ASSIGNMENTS, project_id, assignment_id, "assigned", _day(assigned_at))
+        deltas[key] = deltas.get(key, 0) + 1
+    _bump_many(db, deltas)
+
+
+def record_status_change(db: Session, candidate_assignment: CandidateAssignment, old_status: Optional[str]):
+    """Move a candidate assignment from its old status counter to its current one"""
+    new_status = candidate_assignment.status or "assigned"
+    old_status = old_status or "assigned"
+    if new_status == old_status:
+        return
+    project_id = candidate_assignment.assignment.project_id
+    day = _day(candidate_assignment.assigned_at)
+    _bump(db, (METRIC_CANDIDATE_ASSIGNMENTS, project_id, candidate_assignment.assignment_id, old_status, day), -1)
+    _bump(db, (METRIC_CANDIDATE_ASSIGNMENTS, project_id, candidate_assignment.assignment_id, new_status, day), 1)
+
+
+def record_certificate(db: Session, certificate: Certificate, project_id: UUID, delta: int = 1):
+    """Count an issued (delta=1) or revoked (delta=-1) certificate"""
+    _bump(db, (
+        METRIC_CERTIFICATES,
+        project_id,
+        certificate.assignment_id,
+        "passing" if certificate.is_passing_score else "failing",
+        _day(certificate.issued_at),
+    ), delta)
+
+
+def sum_counter_value(*criteria):
+    """SUM of counter values matching criteria, 0 when nothing matches"""
+    total = func.sum(RollupCounter.value)
+    if criteria:
+        total = total.filter(and_(*criteria))
+    return func.coalesce(total, 0)
+
+
+def _expected_counters(db: Session) -> Dict[RollupKey, int]:
+    """Recompute every counter from the source tables"""
+    # Archived candidate assignments still count
+    candidate_assignments = with_archived(CandidateAssignment)
+    assignment_day = func.date(func.timezone("UTC", candidate_assignments.c.assigned_at))
+    assignment_status = func.coalesce(candidate_assignments.c.status, "assigned")
+    assignment_rows = db.query(
+        literal(METRIC_CANDIDATE_ASSIGNMENTS),
+        Assignment.project_id,
+        candidate_assignments.c.assignment_id,
+        assignment_status,
+        assignment_day,
+        func.count(candidate_assignments.c.id),
+    ).select_from(candidate_assignments).join(
+        Assignment, Assignment.id == candidate_assignments.c.assignment_id
+    ).group_by(
+        Assignment.project_id,
+        candidate_assignments.c.assignment_id,
+        assignment_status,
+        assignment_day,
+    )
+
+    certificate_day = func.date(func.timezone("UTC", Certificate.issued_at))
+    certificate_status = case((Certificate.score >= PASSING_SCORE, "passing"), else_="failing")
+    certificate_rows = db.query(
+        literal(METRIC_CERTIFICATES),
+        Assignment.project_id,
+        Certificate.assignment_id,
+        certificate_status,
+        certificate_day,
+        func.count(Certificate.id),
+    ).join(Assignment).filter(Certificate.is_active == True).group_by(
+        Assignment.project_id,
+        Certificate.assignment_id,
+        certificate_status,
+        certificate_day,
+    )
+
+    expected = {}
+    for row in list(assignment_rows) + list(certificate_rows):
+        expected[tuple(row[:5])] = row[5]
+    return expected
+
+
+def reconcile_rollups(db: Session, dry_run: bool = False) -> List[dict]:
+    """Rebuild all counters from scratch and return the drift that was found.
+
+    The counter table is locked for the duration so concurrent writers queue
+    behind the rebuild instead of bumping counters that are about to be
+    replaced.
+    """
+    if db.bind.dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE rollup_counters IN EXCLUSIVE MODE"))
+
+    expected = _expected_counters(db)
+    actual = {
+        (row.metric, row.project_id, row.assignment_id, row.status, row.day): row.value
+        for row in db.query(RollupCounter).all()
+    }
+
+    drift = []
+    for key in sorted(set(expected) | set(actual), key=str):
+        expected_value = expected.get(key, 0)
+        actual_value = actual.get(key, 0)
+        if expected_value != actual_value:
+            metric, project_id, assignment_id, status, day = key
+            drift.append({
+                "metric": metric,
+                "project_id": str(project_id),
+                "assignment_id": str(assignment_id),
+                "status": status,
+                "day": day.isoformat(),
+                "expected": expected_value,
+                "actual": actual_value,
+            })
+
+    if dry_run:
+        db.rollback()
+        return drift
+
+    db.query(RollupCounter).delete(synchronize_session=False)
+    db.bulk_insert_mappings(RollupCounter, [
+        {
+            "metric": metric,
+            "project_id": project_id,
+            "assignment_id": assignment_id,
+            "status": status,
+            "day": day,
+            "value": value,
+        }
+        for (metric, project_id, assignment_id, status, day), value in expected.items()
+        if value
+    ])
+    db.commit()
+    return drift
@@ -0,0 +1,118 @@
+from typing import Dict, List, Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import func, literal, select, true
+from sqlalchemy.orm import Session
+
+from ..core.cache import local_cache
+from ..core.config import settings
+from ..models.archive import with_archived
+from ..models.assignment import Assignment
+from ..models.candidate_assignment import CandidateAssignment
+from ..models.certificate import Certificate
+from ..models.review import Review
+from ..models.submission import Submission
+
+PERCENTILES = [10, 25, 50, 75, 90, 95, 99]
+
+
+def _score_source(source: str):
+    """Score column, FROM clause reaching assignments, and base criteria"""
+    if source == "certificates":
+        from_clause = Certificate.__table__.join(Assignment.__table__, Certificate.assignment_id == Assignment.id)
+        return Certificate.score, from_clause, [Certificate.is_active == True]
+    # Reviews of archived assignments keep counting
+    reviews = with_archived(Review)
+    submissions = with_archived(Submission)
+    candidate_assignments = with_archived(CandidateAssignment)
+    from_clause = reviews.join(
+        submissions, reviews.c.submission_id == submissions.c.id
+    ).join(
+        candidate_assignments, submissions.c.candidate_assignment_id == candidate_assignments.c.id
+    ).join(
+        Assignment.__table__, candidate_assignments.c.assignment_id == Assignment.id
+    )
+    return reviews.c.score, from_clause, [reviews.c.status == "completed"]
+
+
+def load_scores(
+    db: Session,
+    source: str,
+    assignment_id: Optional[UUID] = None,
+    project_id: Optional[UUID] = None,
+    skillset: Optional[str] = None,
+    group_by: Optional[str] = None,
+) -> Dict[str, np.ndarray]:
+    """Sorted score arrays per group ("all" when ungrouped), cached per filter set.
+
+    Scores are fetched in one columnar query; the arrays stay in process so
+    threshold what-if requests against the same filters never hit the database.
+    """
+    cache_key = f"scores:{source}:{assignment_id}:{project_id}:{skillset}:{group_by}"
+    cached = local_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    score, from_clause, criteria = _score_source(source)
+    criteria = criteria + [score.isnot(None)]
+    if assignment_id:
+        criteria.append(Assignment.id == assignment_id)
+    if project_id:
+        criteria.append(Assignment.project_id == project_id)
+    if skillset:
+        criteria.append(Assignment.skillsets.contains([skillset]))
+
+    if group_by == "skillset":
+        skillsets = func.unnest(Assignment.skillsets).table_valued("skillset").render_derived()
+        from_clause = from_clause.join(skillsets, true())
+        group_key = skillsets.c.skillset
+    elif group_by == "assignment":
+        group_key = Assignment.id
+    elif group_by == "project":
+        group_key = Assignment.project_id
+    else:
+        group_key = literal("all")
+
+    rows = db.execute(select(group_key, score).select_from(from_clause).where(*criteria)).all()
+    keys = np.array([str(row[0]) for row in rows], dtype=str)
+    scores = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+
+    # Sort by group then score so every group is a contiguous, sorted slice
+    order = np.lexsort((scores, keys))
+    keys, scores = keys[order], scores[order]
+    unique_keys, starts = np.unique(keys, return_index=True)
+    ends = np.append(starts[1:], len(scores))
+    groups = {key: scores[start:end] for key, start, end in zip(unique_keys, starts, ends)}
+    if group_by is None:
+        groups.setdefault("all", np.empty(0, dtype=np.float64))
+
+    local_cache.set(cache_key, groups, settings.SCORE_CACHE_TTL_SECONDS)
+    return groups
+
+
+def summarize_scores(sorted_scores: np.ndarray, thresholds: List[int], bins: int) -> dict:
+    """Histogram, percentiles and pass rates of an ascending score array"""
+    count = len(sorted_scores)
+    histogram, edges = np.histogram(sorted_scores, bins=bins, range=(0, 100))
+    # Scores at or above each threshold: everything right of its insertion point
+    passing = count - np.searchsorted(sorted_scores, np.asarray(thresholds, dtype=np.float64), side="left")
+
+    summary = {
+        "count": count,
+        "mean": round(float(sorted_scores.mean()), 2) if count else None,
+        "std": round(float(sorted_scores.std()), 2) if count else None,
+        "histogram": [
+            {"min": round(float(edges[index]), 2), "max": round(float(edges[index + 1]), 2), "count": int(histogram[index])}
+            for index in range(bins)
+        ],
+        "percentiles": {},
+        "pass_rates": {
+            str(threshold): round(float(passed) / count * 100, 2) if count else 0
+            for threshold, passed in zip(thresholds, passing)
+        },
+    }
+    if count:
+        values = np.percentile(sorted_scores, PERCENTILES)
+        summary["percentiles"] = {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, values)}
+    return summary
@@ -0,0 +1,169 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import Date, DateTime, and_, cast, func, insert, literal, select, text, true
+from sqlalchemy.orm import Session
+
+from ..models.activity import (
+    ActivityBucket, JobWatermark, ALL_SKILLSETS,
+    METRIC_NEW_ASSIGNMENTS, METRIC_SUBMISSIONS, METRIC_REVIEWS, METRIC_COMPLETIONS, METRIC_CERTIFICATES,
+)
+from ..models.archive import with_archived
+from ..models.assignment import Assignment
+from ..models.candidate_assignment import CandidateAssignment
+from ..models.certificate import Certificate
+from ..models.review import Review
+from ..models.submission import Submission
+
+JOB_NAME = "activity_buckets"
+# Arbitrary constant used as the Postgres advisory lock id of the refresh job
+ADVISORY_LOCK_ID = 7_240_001
+# Rows committed slightly after the previous run started are still picked up
+WATERMARK_OVERLAP = timedelta(hours=1)
+
+
+def _activity_sources():
+    """Event timestamp column and FROM clause (reaching assignments) for each metric.
+
+    Archived rows are included so rebuilding old buckets keeps their history.
+    """
+    candidate_assignments = with_archived(CandidateAssignment)
+    submissions = with_archived(Submission)
+    reviews = with_archived(Review)
+    assignments_from = candidate_assignments.join(
+        Assignment.__table__, candidate_assignments.c.assignment_id == Assignment.id
+    )
+    submissions_from = submissions.join(
+        assignments_from, submissions.c.candidate_assignment_id == candidate_assignments.c.id
+    )
+    return {
+        METRIC_NEW_ASSIGNMENTS: (candidate_assignments.c.assigned_at, assignments_from),
+        METRIC_SUBMISSIONS: (submissions.c.submitted_at, submissions_from),
+        METRIC_REVIEWS: (reviews.c.reviewed_at, reviews.join(submissions_from, reviews.c.submission_id == submissions.c.id)),
+        METRIC_COMPLETIONS: (candidate_assignments.c.completed_at, assignments_from),
+        # Only active certificates count, as in the rollups and the dashboard
+        METRIC_CERTIFICATES: (Certificate.issued_at, Certificate.__table__.join(
+            Assignment.__table__, and_(Certificate.assignment_id == Assignment.id, Certificate.is_active == True)
+        )),
+    }
+
+
+def _rebuild_buckets(db: Session, since: Optional[date]):
+    """Recompute every bucket on or after since (all buckets when since is None)"""
+    delete = db.query(ActivityBucket)
+    if since is not None:
+        delete = delete.filter(ActivityBucket.day >= since)
+    delete.delete(synchronize_session=False)
+
+    columns = ["metric", "day", "project_id", "skillset", "value"]
+    for metric, (timestamp, from_clause) in _activity_sources().items():
+        day = func.date(func.timezone("UTC", timestamp))
+        criteria = [timestamp.isnot(None)]
+        if since is not None:
+            criteria.append(timestamp >= datetime.combine(since, time.min, tzinfo=timezone.utc))
+
+        # Per-project totals
+        totals = select(
+            literal(metric), day, Assignment.project_id, literal(ALL_SKILLSETS), func.count()
+        ).select_from(from_clause).where(*criteria).group_by(day, Assignment.project_id)
+        db.execute(insert(ActivityBucket).from_select(columns, totals))
+
+        # One bucket per skillset of the assignment
+        skillsets = func.unnest(Assignment.skillsets).table_valued("skillset").render_derived()
+        per_skillset = select(
+            literal(metric), day, Assignment.project_id, skillsets.c.skillset, func.count()
+        ).select_from(from_clause.join(skillsets, true())).where(*criteria).group_by(
+            day, Assignment.project_id, skillsets.c.skillset
+        )
+        db.execute(insert(ActivityBucket).from_select(columns, per_skillset))
+
+
+def refresh_activity_buckets(db: Session, full: bool = False) -> Optional[date]:
+    """Rebuild the buckets that changed since the last run.
+
+    Returns the first rebuilt day (None for a full backfill). Runs are
+    serialized with an advisory lock; a run that cannot take it is skipped.
+    """
+    acquired = db.execute(
+        text("SELECT pg_try_advisory_xact_lock(:lock_id)"), {"lock_id": ADVISORY_LOCK_ID}
+    ).scalar()
+    if not acquired:
+        db.rollback()
+        return None
+
+    run_started = db.query(func.now()).scalar()
+    watermark = db.query(JobWatermark).filter(JobWatermark.job_name == JOB_NAME).first()
+
+    since = None
+    if watermark is not None and not full:
+        since = (watermark.last_run_at - WATERMARK_OVERLAP).astimezone(timezone.utc).date()
+    _rebuild_buckets(db, since)
+
+    if watermark is None:
+        db.add(JobWatermark(job_name=JOB_NAME, last_run_at=run_started))
+    else:
+        watermark.last_run_at = run_started
+    db.commit()
+    return since
+
+
+def _period_start(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_period(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day + timedelta(days=7)
+    if granularity == "month":
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return day + timedelta(days=1)
+
+
+def get_activity_series(
+    db: Session,
+    metrics: List[str],
+    granularity: str,
+    start_date: date,
+    end_date: date,
+    project_id: Optional[UUID] = None,
+    skillset: Optional[str] = None,
+) -> Dict[str, List[dict]]:
+    """Read gap-filled series for each metric from the buckets only"""
+    start_date = _period_start(start_date, granularity)
+    period = cast(func.date_trunc(granularity, cast(ActivityBucket.day, DateTime)), Date)
+    query = db.query(
+        ActivityBucket.metric, period.label("period"), func.sum(ActivityBucket.value)
+    ).filter(
+        ActivityBucket.metric.in_(metrics),
+        ActivityBucket.day >= start_date,
+        ActivityBucket.day <= end_date,
+        ActivityBucket.skillset == (skillset or ALL_SKILLSETS),
+    )
+    if project_id:
+        query = query.filter(ActivityBucket.project_id == project_id)
+
+    values = {
+        (metric, period_start): int(total)
+        for metric, period_start, total in query.group_by(ActivityBucket.metric, period)
+    }
+
+    periods = []
+    current = start_date
+    while current <= end_date:
+        periods.append(current)
+        current = _next_period(current, granularity)
+
+    return {
+        metric: [{"period": day.isoformat(), "value": values.get((metric, day), 0)} for day in periods]
+        for metric in metrics
+    }
+
+
+def get_last_refreshed_at(db: Session) -> Optional[datetime]:
+    watermark = db.query(JobWatermark).filter(JobWatermark.job_name == JOB_NAME).first()
+    return watermark.last_run_at if watermark else None
@@ -0,0 +1,49 @@
+from .core.celery import celery_app
+from .core.database import SessionLocal
+# Import every model so string relationships resolve inside the worker
+from .models import activity, archive, assignment, candidate_assignment, certificate, project, review, rollup, submission, user  # noqa: F401
+
+
+@celery_app.task(name="app.tasks.refresh_activity_buckets")
+def refresh_activity_buckets(full: bool = False):
+    """Rebuild the daily activity buckets that changed since the last run"""
+    from .services.timeseries_service import refresh_activity_buckets as refresh
+
+    db = SessionLocal()
+    try:
+        since = refresh(db, full=full)
+    finally:
+        db.close()
+    return since.isoformat() if since else None
+
+
+@celery_app.task(name="app.tasks.archive_finished_assignments")
+def archive_finished_assignments():
+    """Move finished candidate assignments older than ARCHIVE_AFTER_DAYS to the archive tables"""
+    from .services.archive_service import archive_finished_assignments as archive_finished
+
+    db = SessionLocal()
+    try:
+        return archive_finished(db)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.run_report_job")
+def run_report_job(job_id: str, report: str, params: dict):
+    """Build a heavy report and cache its result for the job API"""
+    from .services.report_jobs import run_report
+
+    db = SessionLocal()
+    try:
+        run_report(db, job_id, report, params)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.cleanup_report_exports")
+def cleanup_report_exports():
+    """Delete report export files whose job results have expired"""
+    from .services.report_jobs import remove_expired_exports
+
+    return remove_expired_exports()
@@ -0,0 +1,148 @@
+"""
+Login storm benchmark: latency of a cheap endpoint while logins run bcrypt.
+
+Serves the auth router in process against a throwaway in-memory SQLite
+database, then measures /health latency alone and during a storm of
+concurrent logins. Pass --inline to verify passwords on the event loop the
+way login used to, for comparison.
+
+Usage: python scripts/benchmark_login_storm.py [--logins 100] [--concurrency 50] [--inline]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from app.api.v1 import auth  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import SessionLocal, init_db  # noqa: E402
+from app.core.security import get_password_hash, password_pool, verify_password  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+EMAIL = "storm@example.com"
+PASSWORD = "benchmark-password"
+PROBE_INTERVAL_SECONDS = 0.01
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/auth")
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    return app
+
+
+def seed_user():
+    init_db()
+    db = SessionLocal()
+    try:
+        if db.query(User).filter(User.email == EMAIL).first() is None:
+            db.add(User(email=EMAIL, full_name="Storm", password_hash=get_password_hash(PASSWORD), role="candidate"))
+            db.commit()
+    finally:
+        db.close()
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, latencies: list):
+    """Request /health every PROBE_INTERVAL_SECONDS.
+
+    Latency is measured from when each request was due, so time the event
+    loop spent blocked before the probe could run counts as it would for a
+    client waiting on the socket.
+    """
+    due = time.perf_counter()
+    while not stop.is_set():
+        await client.get("/health")
+        finished = time.perf_counter()
+        latencies.append((finished - due) * 1000)
+        due = finished + PROBE_INTERVAL_SECONDS
+        await asyncio.sleep(PROBE_INTERVAL_SECONDS)
+
+
+async def login_storm(client: httpx.AsyncClient, logins: int, concurrency: int) -> Counter:
+    outcomes = Counter()
+    remaining = iter(range(logins))
+
+    async def worker():
+        for _ in remaining:
+            response = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            outcomes[response.status_code] += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return outcomes
+
+
+def summarize(latencies: list) -> str:
+    if len(latencies) < 2:
+        return f"{len(latencies)} samples"
+    cuts = statistics.quantiles(latencies, n=100)
+    return (
+        f"{len(latencies)} samples, p50 {cuts[49]:.1f} ms, p95 {cuts[94]:.1f} ms, "
+        f"p99 {cuts[98]:.1f} ms, max {max(latencies):.1f} ms"
+    )
+
+
+async def run(args):
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        idle = []
+        stop = asyncio.Event()
+        probing = asyncio.create_task(probe(client, stop, idle))
+        await asyncio.sleep(args.idle_seconds)
+        stop.set()
+        await probing
+
+        loaded = []
+        stop = asyncio.Event()
+        probing = asyncio.create_task(probe(client, stop, loaded))
+        started = time.perf_counter()
+        outcomes = await login_storm(client, args.logins, args.concurrency)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probing
+
+    mode = "inline on the event loop" if args.inline else f"password pool ({password_pool.workers} workers)"
+    print(f"Password verification: {mode}")
+    print(f"/health idle:         {summarize(idle)}")
+    print(f"/health during storm: {summarize(loaded)}")
+    print(
+        f"Logins: {args.logins} in {elapsed:.2f} s ({args.logins / elapsed:.0f}/s), "
+        f"status codes {dict(sorted(outcomes.items()))}"
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--idle-seconds", type=float, default=1.0)
+    parser.add_argument("--inline", action="store_true", help="Verify passwords on the event loop")
+    args = parser.parse_args(argv)
+
+    if args.inline:
+        async def verify_inline(plain_password, hashed_password):
+            return verify_password(plain_password, hashed_password)
+        auth.verify_password_async = verify_inline
+
+    # Every login comes from one client and one email; measure bcrypt, not the limiter
+    settings.RATE_LIMIT_ENABLED = False
+    seed_user()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
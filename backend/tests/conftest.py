@@ -0,0 +1,45 @@
+import os
+
+# Tests run against the in-memory SQLite mode unless told otherwise
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+# Import every model first so string relationships resolve
+from app.models import (  # noqa: E402,F401
+    activity, archive, assignment, candidate_assignment, certificate, project, review, rollup, submission, user
+)
+from app.api.v1 import candidates, certificates, reviews  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.core.security import access_token_claims, create_access_token, new_token_family  # noqa: E402
+from app.core.sql_metrics import SQLInstrumentationMiddleware  # noqa: E402
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "postgres: needs the PostgreSQL database named by TEST_POSTGRES_URL")
+
+
+@pytest.fixture(scope="session")
+def app() -> FastAPI:
+    init_db()
+    app = FastAPI()
+    app.add_middleware(SQLInstrumentationMiddleware)
+    app.include_router(candidates.router, prefix="/candidates")
+    app.include_router(certificates.router, prefix="/certificates")
+    app.include_router(reviews.router, prefix="/reviews")
+    return app
+
+
+@pytest.fixture
+def client(app, monkeypatch) -> TestClient:
+    # X-DB-Query-Count is only sent in debug mode
+    monkeypatch.setattr(settings, "DEBUG", True)
+    return TestClient(app)
+
+
+def auth_headers(user) -> dict:
+    token = create_access_token(access_token_claims(user, new_token_family()))
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,144 @@
+"""
+List and detail endpoints must run a fixed number of statements however many
+rows they return: relationships come from the loading profiles in
+app/models/loading.py, never from per-row lazy loads.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.database import SessionLocal
+from app.models.assignment import Assignment
+from app.models.candidate_assignment import CandidateAssignment
+from app.models.certificate import Certificate
+from app.models.project import Project
+from app.models.review import Review
+from app.models.submission import Submission
+from app.models.user import User
+
+from .conftest import auth_headers
+
+ROWS = 30
+SMALL_PAGE = 2
+# Largest endpoint: parent row, page, one SELECT ... IN per collection and the
+# archived history (authentication is served from the principal cache)
+MAX_QUERIES = 4
+
+
+def _user(db, role: str, name: str) -> User:
+    user = User(email=f"{name}-{uuid.uuid4().hex[:8]}@example.com", full_name=name, password_hash="x", role=role)
+    db.add(user)
+    return user
+
+
+def _candidate_assignment(db, candidate, assignment, admin, submitted_at) -> Submission:
+    candidate_assignment = CandidateAssignment(
+        candidate=candidate, assignment=assignment, assigned_by=admin.id,
+        status="submitted", assigned_at=submitted_at, deadline=submitted_at + timedelta(days=7),
+    )
+    submission = Submission(
+        candidate_assignment=candidate_assignment, submission_type="github_pr",
+        status="submitted", submitted_at=submitted_at,
+    )
+    db.add_all([candidate_assignment, submission])
+    return submission
+
+
+@pytest.fixture(scope="module")
+def seeded(app):
+    """ROWS candidate assignments, submissions and certificates over distinct
+    candidates, plus one candidate and one submission with many children"""
+    db = SessionLocal()
+    try:
+        admin = _user(db, "admin", "Admin")
+        project = Project(name="Query counts", difficulty_level="beginner")
+        db.add(project)
+        db.flush()
+
+        start = datetime.now(timezone.utc) - timedelta(days=1)
+        assignments = []
+        for i in range(ROWS):
+            assignment = Assignment(
+                project=project, title=f"Assignment {i}", skillsets=["python"],
+                difficulty_level="beginner", duration_days=7, created_by=admin.id,
+            )
+            assignments.append(assignment)
+            candidate = _user(db, "candidate", f"Candidate {i}")
+            _candidate_assignment(db, candidate, assignment, admin, start + timedelta(minutes=i))
+            db.add(Certificate(
+                candidate=candidate, assignment=assignment, certificate_number=f"QC-{uuid.uuid4().hex[:12]}",
+                score=80, issued_at=start + timedelta(minutes=i),
+            ))
+
+        quiet = _user(db, "candidate", "Quiet")
+        _candidate_assignment(db, quiet, assignments[0], admin, start)
+        busy = _user(db, "candidate", "Busy")
+        for i, assignment in enumerate(assignments):
+            _candidate_assignment(db, busy, assignment, admin, start + timedelta(minutes=i))
+
+        reviewed_once = _candidate_assignment(db, quiet, assignments[1], admin, start)
+        reviewed_often = _candidate_assignment(db, busy, assignments[0], admin, start)
+        db.add(Review(submission=reviewed_once, reviewer=_user(db, "reviewer", "Reviewer"), score=70))
+        for i in range(ROWS):
+            db.add(Review(submission=reviewed_often, reviewer=_user(db, "reviewer", f"Reviewer {i}"), score=70))
+        db.commit()
+
+        certificate_id = db.query(Certificate.id).first()[0]
+        yield {
+            "headers": auth_headers(admin),
+            "quiet": quiet.id,
+            "busy": busy.id,
+            "reviewed_once": reviewed_once.id,
+            "reviewed_often": reviewed_often.id,
+            "certificate": certificate_id,
+        }
+    finally:
+        db.close()
+
+
+def _query_count(client, url: str, headers: dict) -> int:
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    return int(response.headers["X-DB-Query-Count"])
+
+
+@pytest.mark.parametrize("url", [
+    "/candidates/assignments?cursor=&limit={limit}",
+    "/candidates/assignments?limit={limit}",
+    "/certificates/?cursor=&limit={limit}",
+    "/reviews/pending?cursor=&limit={limit}",
+])
+def test_list_query_count_does_not_grow_with_page_size(client, seeded, url):
+    headers = seeded["headers"]
+    # Warm the principal cache so both pages pay the same for authentication
+    client.get(url.format(limit=1), headers=headers)
+
+    small = _query_count(client, url.format(limit=SMALL_PAGE), headers)
+    large = _query_count(client, url.format(limit=ROWS), headers)
+
+    assert small == large
+    assert large <= MAX_QUERIES
+
+
+@pytest.mark.parametrize("url, few, many", [
+    ("/candidates/candidates/{id}/assignments", "quiet", "busy"),
+    ("/reviews/submissions/{id}/reviews", "reviewed_once", "reviewed_often"),
+])
+def test_detail_query_count_does_not_grow_with_children(client, seeded, url, few, many):
+    headers = seeded["headers"]
+    client.get(url.format(id=seeded[few]), headers=headers)
+
+    small = _query_count(client, url.format(id=seeded[few]), headers)
+    large = _query_count(client, url.format(id=seeded[many]), headers)
+
+    assert small == large
+    assert large <= MAX_QUERIES
+
+
+def test_certificate_detail_query_count(client, seeded):
+    url = f"/certificates/{seeded['certificate']}"
+    client.get(url, headers=seeded["headers"])
+
+    assert _query_count(client, url, seeded["headers"]) <= MAX_QUERIES